@@ -14,7 +14,7 @@ State Management:
     The core module provides robust state persistence through three files:
 
     - ``state.json``: Complete pipeline state with checkpoints and metrics
-    - ``dead_letters.json``: Failed agent contexts for recovery and replay
+    - ``dead_letters.jsonl``: Failed agent contexts for recovery and replay
     - ``transitions.jsonl``: Chronological audit log of all state transitions
 
 Key Classes:
@@ -11,6 +11,8 @@ Security Considerations:
 - Path traversal prevention for artifact access
 """
 
+import copy
+import functools
 import os
 import re
 import yaml
@@ -31,10 +33,36 @@ try:
 except ImportError:
     ANTHROPIC_AVAILABLE = False
 
+# Prefer the libyaml-backed loader; the pure-Python one is much slower
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=8)
+def _load_config_cached(path_str: str, mtime_ns: int, size: int) -> Dict[str, Any]:
+    """Parse a config file, memoized per (path, mtime, size) for this process."""
+    with open(path_str) as f:
+        return yaml.load(f, Loader=_YamlLoader)
+
+
+@functools.lru_cache(maxsize=32)
+def _load_prompt_cached(path_str: str, mtime_ns: int, size: int) -> str:
+    """Read an agent prompt without its YAML frontmatter, memoized per file version."""
+    content = Path(path_str).read_text()
+    
+    # Extract main content (skip YAML frontmatter if present)
+    if content.startswith("---"):
+        end = content.find("---", 3)
+        return content[end + 3:].strip() if end != -1 else content
+    
+    return content
+
+
 class AgentInvoker:
     """
     Invokes SOMAS agents using direct LLM API calls.
@@ -82,20 +110,30 @@ class AgentInvoker:
         Returns:
             True if valid, False otherwise
         """
-        return bool(self.PROJECT_ID_PATTERN.match(project_id))
+        # fullmatch: with match(), '$' would also accept a trailing newline
+        return (
+            type(project_id) is str
+            and len(project_id) > 8
+            and self.PROJECT_ID_PATTERN.fullmatch(project_id) is not None
+        )
     
     def _load_config(self) -> Dict[str, Any]:
         """
         Load agent configuration from .somas/config.yml
         
+        The YAML is parsed once per process while the file's mtime and size
+        are unchanged; each invoker gets its own copy.
+        
         Returns:
             Configuration dictionary
         """
-        if not self.config_path.exists():
-            raise FileNotFoundError(f"Config file not found: {self.config_path}")
+        try:
+            st = self.config_path.stat()
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Config file not found: {self.config_path}") from None
         
-        with open(self.config_path) as f:
-            return yaml.safe_load(f)
+        config = _load_config_cached(os.path.abspath(self.config_path), st.st_mtime_ns, st.st_size)
+        return copy.deepcopy(config)
     
     def _load_agent_prompt(self, agent_name: str) -> str:
         """
@@ -109,17 +147,13 @@ class AgentInvoker:
         """
         agent_file = self.agents_dir / f"somas-{agent_name}.md"
         
-        if not agent_file.exists():
-            raise FileNotFoundError(f"Agent file not found: {agent_file}")
-        
-        content = agent_file.read_text()
-        
-        # Extract main content (skip YAML frontmatter if present)
-        if content.startswith("---"):
-            parts = content.split("---", 2)
-            return parts[2].strip() if len(parts) > 2 else content
+        try:
+            st = agent_file.stat()
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Agent file not found: {agent_file}") from None
         
-        return content
+        # Reparsed only when the file's mtime or size changes
+        return _load_prompt_cached(os.path.abspath(agent_file), st.st_mtime_ns, st.st_size)
     
     def _get_agent_config(self, agent_name: str) -> Dict[str, Any]:
         """
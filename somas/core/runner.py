@@ -20,22 +20,249 @@ Security:
 """
 
 import argparse
+import functools
 import json
+import os
 import re
 import sys
+import threading
 import traceback
+from collections import OrderedDict
+from collections.abc import Mapping
 from datetime import datetime
 from pathlib import Path
+from types import MappingProxyType
 from typing import Any, Dict, List, Optional
 
 import yaml
 
+# Prefer the libyaml-backed loader; the pure-Python one is much slower
+try:
+    from yaml import CSafeLoader as _YamlLoader
+    YAML_C_LOADER_AVAILABLE = True
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+    YAML_C_LOADER_AVAILABLE = False
+
 # Import state manager
 try:
     from .state_manager import StateManager
 except ImportError:
     from state_manager import StateManager
 
+# Optional fast JSON encoder for task metadata
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Context files cached in-process, keyed by real path (LRU bounded)
+MAX_CACHED_CONTEXT_FILES = 128
+_FILE_CACHE: "OrderedDict[str, tuple]" = OrderedDict()
+_FILE_CACHE_LOCK = threading.Lock()
+
+# Salvages the issue number from benign malformed IDs like "project-123-extra"
+_SANITIZE_PROJECT_ID_RE = re.compile(r"^project-(\d+)[-\w]*$")
+
+
+def _is_valid_project_id(project_id: Any) -> bool:
+    """Return True if project_id matches ``project-<number>``."""
+    # Plain string checks are enough for this fixed prefix, and unlike
+    # ``re.match(r"^...$")`` they do not accept a trailing newline.
+    return (
+        type(project_id) is str
+        and project_id.startswith("project-")
+        and len(project_id) > 8
+        and project_id[8:].isdecimal()
+    )
+
+
+def _dumps_indented(obj: Any) -> bytes:
+    """Serialize to UTF-8 JSON with 2-space indentation."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def _config_cache_path(config_path: Path) -> Path:
+    """Return the JSON cache file that sits next to a YAML config."""
+    return config_path.with_name(config_path.name + ".cache.json")
+
+
+def _read_config_cache(cache_path: Path, mtime_ns: int, size: int) -> Optional[Dict[str, Any]]:
+    """
+    Return cached config data if it was built from the current YAML file.
+
+    The cache is keyed on the source's mtime and size; any mismatch or
+    unreadable cache is treated as a miss.
+    """
+    try:
+        with open(cache_path, "r") as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if (
+        isinstance(cached, dict)
+        and cached.get("mtime_ns") == mtime_ns
+        and cached.get("size") == size
+    ):
+        return cached.get("data")
+    return None
+
+
+def _write_config_cache(cache_path: Path, mtime_ns: int, size: int, data: Any) -> None:
+    """
+    Best-effort write of parsed config data to its JSON cache.
+
+    Configs that do not survive a JSON round trip unchanged (dates,
+    non-string keys, ...) are not cached so a hit always matches YAML.
+    """
+    try:
+        if json.loads(json.dumps(data)) != data:
+            return
+    except (TypeError, ValueError):
+        return
+
+    tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, "w") as f:
+            json.dump({"mtime_ns": mtime_ns, "size": size, "data": data}, f)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        # Read-only checkouts etc. simply run without a cache
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+
+
+def _freeze(obj: Any) -> Any:
+    """Recursively convert dicts to read-only mappings and lists to tuples."""
+    if isinstance(obj, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in obj.items()})
+    if isinstance(obj, list):
+        return tuple(_freeze(v) for v in obj)
+    return obj
+
+
+@functools.lru_cache(maxsize=16)
+def _load_config_cached(path_str: str, mtime_ns: int, size: int) -> Any:
+    """
+    Parse a config file, memoized per (path, mtime, size) for this process.
+
+    Falls back to the on-disk JSON cache before parsing the YAML. The
+    result is shared between callers, so it is returned frozen.
+    """
+    config_path = Path(path_str)
+    cache_path = _config_cache_path(config_path)
+    cached = _read_config_cache(cache_path, mtime_ns, size)
+    if cached is not None:
+        return _freeze(cached)
+
+    if not YAML_C_LOADER_AVAILABLE:
+        print(
+            "Warning: libyaml not available, using the slower pure-Python YAML loader",
+            file=sys.stderr,
+        )
+    with open(config_path, "r") as f:
+        config = yaml.load(f, Loader=_YamlLoader)
+    _write_config_cache(cache_path, mtime_ns, size, config)
+    return _freeze(config)
+
+
+def _read_text_file(path: str) -> str:
+    """
+    Read a UTF-8 text file with raw reads sized from fstat.
+
+    Newlines are normalized the same way text-mode ``open`` does.
+    """
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        # Ask for one byte more than the file size: a short read then means
+        # EOF, so an unchanged file is read with a single syscall
+        want = os.fstat(fd).st_size + 1
+        chunks = []
+        while True:
+            chunk = os.read(fd, want)
+            chunks.append(chunk)
+            if len(chunk) < want:
+                break
+    finally:
+        os.close(fd)
+    text = (chunks[0] if len(chunks) == 1 else b"".join(chunks)).decode("utf-8")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
+def _read_text_file_cached(path: str) -> str:
+    """
+    Read a text file, reusing the cached content while it is unchanged.
+
+    Entries are validated against the file's mtime and size, so edits
+    between pipeline stages are always picked up.
+    """
+    key = os.path.realpath(path)
+    st = os.stat(key)
+    version = (st.st_mtime_ns, st.st_size)
+
+    with _FILE_CACHE_LOCK:
+        hit = _FILE_CACHE.get(key)
+        if hit is not None and hit[0] == version:
+            _FILE_CACHE.move_to_end(key)
+            return hit[1]
+
+    text = _read_text_file(key)
+
+    with _FILE_CACHE_LOCK:
+        _FILE_CACHE[key] = (version, text)
+        _FILE_CACHE.move_to_end(key)
+        while len(_FILE_CACHE) > MAX_CACHED_CONTEXT_FILES:
+            _FILE_CACHE.popitem(last=False)
+    return text
+
+
+class _LazyContext(Mapping):
+    """
+    Read-only mapping of context file paths to contents, read on demand.
+
+    Keys are known up front so callers can list the context files without
+    any I/O. A file that turns out to be unreadable is reported, dropped
+    from the keys and raises KeyError.
+    """
+
+    def __init__(self, paths: List[str]):
+        self._paths = dict.fromkeys(paths)
+        self._contents: Dict[str, str] = {}
+
+    def __getitem__(self, path: str) -> str:
+        content = self._contents.get(path)
+        if content is not None:
+            return content
+        if path not in self._paths:
+            raise KeyError(path)
+        try:
+            content = _read_text_file_cached(path)
+        except Exception as e:
+            print(f"Warning: Could not read {path}: {e}", file=sys.stderr)
+            del self._paths[path]
+            raise KeyError(path) from e
+        self._contents[path] = content
+        return content
+
+    def __iter__(self):
+        return iter(self._paths)
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+
+def _default_agent_config(agent_name: str) -> Dict[str, Any]:
+    """Configuration used for agents missing from the SOMAS config."""
+    return {"provider": "gpt_5_2", "description": f"Agent: {agent_name}"}
+
 
 class SOMASRunner:
     """Orchestrates agent execution for SOMAS pipeline tasks."""
@@ -43,15 +270,33 @@ class SOMASRunner:
     def __init__(self, config_path: str = ".somas/config.yml"):
         """Initialize runner with SOMAS configuration."""
         self.config_path = Path(config_path)
-        self.config = self._load_config()
         self.repo_root = Path.cwd()
+        self._repo_root_real = os.path.realpath(self.repo_root)
+        self._repo_root_prefix = os.path.join(self._repo_root_real, "")
         self.state_manager = StateManager()
 
-    def _load_config(self) -> Dict[str, Any]:
-        """Load and parse SOMAS configuration."""
+    @functools.cached_property
+    def config(self) -> Mapping[str, Any]:
+        """SOMAS configuration (read-only), loaded on first access."""
+        return self._load_config()
+
+    @functools.cached_property
+    def _agent_configs(self) -> Mapping[str, Any]:
+        """Per-agent configuration table, extracted from the config once."""
+        return self.config.get("agents", {}).get("agent_configs", {})
+
+    def _load_config(self) -> Mapping[str, Any]:
+        """
+        Load and parse SOMAS configuration.
+
+        Parsed YAML is cached as JSON next to the config file and, within
+        a process, memoized in memory; both are reused while the config's
+        mtime and size are unchanged. The result is frozen (read-only
+        mappings and tuples) so it can be shared without copying.
+        """
         try:
-            with open(self.config_path, "r") as f:
-                return yaml.safe_load(f)
+            st = self.config_path.stat()
+            return _load_config_cached(os.path.abspath(self.config_path), st.st_mtime_ns, st.st_size)
         except FileNotFoundError as e:
             raise RuntimeError(f"Config file not found: {self.config_path}") from e
         except yaml.YAMLError as e:
@@ -69,9 +314,7 @@ class SOMASRunner:
         Returns:
             True if valid, False otherwise
         """
-        # Must match pattern: project-<number>
-        pattern = r"^project-\d+$"
-        return bool(re.match(pattern, project_id))
+        return _is_valid_project_id(project_id)
 
     def _ensure_valid_project_id(self, project_id: str, issue_number: Optional[int] = None) -> str:
         """
@@ -114,7 +357,7 @@ class SOMASRunner:
 
         # Try to extract issue number from benign malformed project_id
         # Only handle simple cases like "project-123-extra" not "project-123/../etc"
-        match = re.match(r"^project-(\d+)[-\w]*$", project_id)
+        match = _SANITIZE_PROJECT_ID_RE.match(project_id)
         if match:
             sanitized_id = f"project-{match.group(1)}"
             print(f"Warning: Sanitized invalid project ID '{project_id}' to '{sanitized_id}'", file=sys.stderr)
@@ -138,15 +381,18 @@ class SOMASRunner:
             True if safe, False otherwise
         """
         try:
-            # Resolve to absolute path
-            abs_path = Path(path).resolve()
-            # Ensure it's within the repository
-            abs_path.relative_to(self.repo_root)
-            return True
-        except (ValueError, RuntimeError):
+            # Resolve symlinks too: a plain abspath would let a link inside
+            # the repo point outside of it
+            real_path = os.path.realpath(path)
+            # Ensure it's within the repository (prefix ends with a separator,
+            # so "/repo-other" does not match "/repo")
+            return real_path == self._repo_root_real or real_path.startswith(
+                self._repo_root_prefix
+            )
+        except (ValueError, TypeError, OSError):
             return False
 
-    def _get_agent_config(self, agent_name: str) -> Dict[str, Any]:
+    def _get_agent_config(self, agent_name: str) -> Mapping[str, Any]:
         """
         Get agent configuration from SOMAS config.
 
@@ -156,42 +402,56 @@ class SOMASRunner:
         Returns:
             Agent configuration dictionary
         """
-        agents_config = self.config.get("agents", {}).get("agent_configs", {})
+        agent_config = self._agent_configs.get(agent_name)
 
-        if agent_name not in agents_config:
+        if agent_config is None:
             print(
                 f"Warning: Agent '{agent_name}' not found in config. Using defaults.",
                 file=sys.stderr,
             )
-            return {"provider": "gpt_5_2", "description": f"Agent: {agent_name}"}
+            return _default_agent_config(agent_name)
 
-        return agents_config[agent_name]
+        return agent_config
 
-    def _load_context_files(self, context_files: List[str]) -> Dict[str, str]:
+    def _load_context_files(self, context_files: List[str]) -> Mapping[str, str]:
         """
         Load content from context files.
 
+        Paths are validated immediately, but file contents are only read
+        when looked up.
+
         Args:
             context_files: List of file paths to load
 
         Returns:
-            Dictionary mapping file paths to their content
+            Mapping of file paths to their content
         """
-        context = {}
-
+        # Validate all paths up front in one pass (same containment check as
+        # _validate_path, inlined); contents are read on first access
+        root = self._repo_root_real
+        prefix = self._repo_root_prefix
+        realpath = os.path.realpath
+        validated = []
+        warnings = []
         for file_path in context_files:
-            # Validate path
-            if not self._validate_path(file_path):
-                print(f"Warning: Skipping invalid path: {file_path}", file=sys.stderr)
-                continue
-
             try:
-                with open(file_path, "r") as f:
-                    context[file_path] = f.read()
-            except Exception as e:
-                print(f"Warning: Could not read {file_path}: {e}", file=sys.stderr)
+                real_path = realpath(file_path)
+                is_valid = real_path == root or real_path.startswith(prefix)
+            except (ValueError, TypeError, OSError):
+                is_valid = False
+
+            if not is_valid:
+                warnings.append(f"Warning: Skipping invalid path: {file_path}")
+            elif not os.path.isfile(file_path):
+                warnings.append(f"Warning: Could not read {file_path}: not a file")
+            else:
+                validated.append(file_path)
+
+        # Emit all warnings with a single write instead of one print each
+        if warnings:
+            sys.stderr.write("\n".join(warnings) + "\n")
 
-        return context
+        return _LazyContext(validated)
 
     def run_task(
         self,
@@ -275,24 +535,26 @@ class SOMASRunner:
         error_info = None
 
         try:
-            # Ensure output directory exists
-            output_dir = Path(output_path).parent
-            output_dir.mkdir(parents=True, exist_ok=True)
-
-            # Write task metadata and placeholder result
-            with open(output_path, "w") as f:
-                f.write(f"# Task: {task_name}\n\n")
-                f.write(f"**Description:** {task_desc}\n\n")
-                f.write(f"**Agent:** {agent}\n")
-                f.write(f"**Provider:** {provider}\n\n")
-                f.write("## Status\n\n")
-                f.write(
-                    "Task execution placeholder. Integration with actual AI agents pending.\n\n"
-                )
-                f.write("## Metadata\n\n")
-                f.write("```json\n")
-                json.dump(task_metadata, f, indent=2)
-                f.write("\n```\n")
+            # Build task metadata and placeholder result, then write it once
+            header = (
+                f"# Task: {task_name}\n\n"
+                f"**Description:** {task_desc}\n\n"
+                f"**Agent:** {agent}\n"
+                f"**Provider:** {provider}\n\n"
+                "## Status\n\n"
+                "Task execution placeholder. Integration with actual AI agents pending.\n\n"
+                "## Metadata\n\n"
+                "```json\n"
+            )
+            payload = header.encode("utf-8") + _dumps_indented(task_metadata) + b"\n```\n"
+            try:
+                f = open(output_path, "wb")
+            except FileNotFoundError:
+                # Create the output directory only when it is actually missing
+                Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+                f = open(output_path, "wb")
+            with f:
+                f.write(payload)
 
             print(f"Task completed successfully. Output written to: {output_path}")
             success = True
@@ -521,8 +783,9 @@ class SOMASRunner:
         return 0
 
 
-def main():
-    """Main entry point for the runner CLI."""
+@functools.lru_cache(maxsize=None)
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the runner CLI parser (once per process)."""
     parser = argparse.ArgumentParser(
         description="SOMAS Agent Runner - Execute pipeline tasks with AI agents",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -606,7 +869,13 @@ Examples:
         help="Path to SOMAS configuration file (default: .somas/config.yml)",
     )
 
-    args = parser.parse_args()
+    return parser
+
+
+def main(argv: Optional[List[str]] = None):
+    """Main entry point for the runner CLI."""
+    parser = _build_parser()
+    args = parser.parse_args(argv)
 
     # Initialize runner
     runner = SOMASRunner(config_path=args.config)
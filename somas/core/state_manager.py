@@ -4,7 +4,8 @@ SOMAS State Manager
 
 This module handles persistent JSON state for the SOMAS pipeline:
 - state.json: Pipeline state, checkpoints, labels, metrics
-- dead_letters.json: Failed agent contexts for recovery/replay/debugging
+- dead_letters.jsonl: Failed agent contexts for recovery/replay/debugging
+- dead_letters.stats.json: Dead letter counts by stage and agent
 - transitions.jsonl: Chronological audit log of all state transitions
 
 Security:
@@ -14,20 +15,66 @@ Security:
     - JSON schema validation on read/write
 """
 
+import argparse
+import atexit
+import functools
+import itertools
 import json
-import uuid
+import logging
+import os
+import threading
+import time
 import sys
-from datetime import datetime
+import weakref
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Dict, Any, List, Optional
-import re
+from typing import Dict, Any, Iterator, List, Optional
 from filelock import FileLock
 import yaml
 
+# Optional fast JSON backend; falls back to the stdlib json module
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Prefer the libyaml-backed loader; the pure-Python one is much slower
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+
+logger = logging.getLogger(__name__)
+
 
 # Default maximum checkpoints to retain (prevents unbounded state.json growth)
 DEFAULT_MAX_CHECKPOINTS = 20
 
+# Valid project IDs are "project-<number>"
+_PROJECT_ID_PREFIX = "project-"
+
+# Seconds to wait for a cross-process file lock before raising filelock.Timeout
+LOCK_TIMEOUT = 30
+
+# Transitions are buffered briefly and appended to transitions.jsonl in batches
+TRANSITION_FLUSH_INTERVAL = 0.01  # seconds
+MAX_PENDING_TRANSITION_BYTES = 1024 * 1024  # flush immediately past this size
+TRANSITION_WRITER_IDLE_TIMEOUT = 1.0  # seconds before an idle writer thread exits
+
+# A single_writer manager appends payloads up to this size without taking
+# its in-process lock (transition flushes are already serialized)
+ATOMIC_APPEND_MAX_BYTES = 4096 if os.name == "posix" else 0
+
+# Most recent get_dead_letters results kept per project
+MAX_CACHED_DEAD_LETTER_QUERIES = 128
+
+# Short, highly repeated JSONL fields, interned once when parsed
+_INTERNED_FIELDS = ("stage", "agent", "event_type")
+
 
 # 11-Stage SDLC Pipeline
 VALID_STAGES = [
@@ -44,17 +91,321 @@ VALID_STAGES = [
     "analyze",     # Stage 11: Metrics and documentation
 ]
 
+# Defaults for new projects; initialize_project copies these per call
+_DEFAULT_LABELS = ("somas-project", "somas:dev")
+_DEFAULT_STAGE_TEMPLATE = {"status": "pending", "retry_count": 0}
+
+
+def _dump_bytes(data: Any) -> bytes:
+    """
+    Serialize data as compact UTF-8 JSON (state and dead letter files).
+    
+    Files are stored without indentation; use ``state_manager.py cat`` or
+    ``jq`` to read them.
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def _dump_line(data: Any) -> bytes:
+    """Serialize data as a single newline-terminated JSONL record."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE)
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8') + b'\n'
+
+
+def _load_bytes(data: bytes) -> Any:
+    """Parse JSON from bytes (or str)."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _copy_json(data: Any) -> Any:
+    """Deep copy JSON data with a serialize/parse round trip (faster than deepcopy)."""
+    return _load_bytes(_dump_bytes(data))
+
+
+def _write_all(fd: int, data: bytes) -> None:
+    """Write all of data to a raw file descriptor (os.write may be partial)."""
+    view = memoryview(data)
+    while view:
+        written = os.write(fd, view)
+        view = view[written:]
+
+
+@functools.lru_cache(maxsize=16)
+def _load_max_checkpoints(config_path: str, mtime_ns: int, size: int) -> int:
+    """
+    Read state_manager.max_checkpoints from a config file.
+    
+    Cached per process for each (path, mtime_ns, size), so managers created
+    for the same unchanged config share one YAML parse.
+    """
+    with open(config_path) as f:
+        config = yaml.load(f, Loader=_YamlLoader) or {}
+    return config.get("state_manager", {}).get("max_checkpoints", DEFAULT_MAX_CHECKPOINTS)
+
+
+def _stat_key(path: Path) -> Optional[tuple]:
+    """Return (inode, mtime_ns, size) for a file, or None if it is missing."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def _is_unrecovered(entry: Dict[str, Any]) -> bool:
+    """Whether a dead letter has not been successfully recovered."""
+    return not entry.get("recovery_attempted") or entry.get("recovery_result") != "success"
+
+
+def _recorded_before(entry: Dict[str, Any], cutoff: datetime) -> bool:
+    """Whether an entry's timestamp is before cutoff (False if unreadable)."""
+    try:
+        return datetime.fromisoformat(entry["timestamp"].replace('Z', '+00:00')) < cutoff
+    except (KeyError, AttributeError, TypeError, ValueError):
+        return False
+
+
+def _read_at(fd: int, offset: int, size: int) -> bytes:
+    """Read up to size bytes starting at offset (fewer only at EOF)."""
+    os.lseek(fd, offset, os.SEEK_SET)
+    chunks = []
+    while size > 0:
+        chunk = os.read(fd, size)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b''.join(chunks)
+
+
+def _empty_dead_letter_statistics() -> Dict[str, Any]:
+    """Return zeroed dead letter statistics."""
+    return {
+        "total_entries": 0,
+        "by_stage": {},
+        "by_agent": {},
+        "recovered": 0,
+        "unrecovered": 0
+    }
+
+
+def _increment_metric(state: Dict[str, Any], name: str, amount: int = 1) -> None:
+    """Increment a counter in state["metrics"] in place, creating it if needed."""
+    metrics = state.setdefault("metrics", {})
+    metrics[name] = metrics.get(name, 0) + amount
+
+
+def _fsync_dir(path: Path) -> None:
+    """fsync a directory so a rename inside it is durable (no-op on Windows)."""
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    fd = os.open(path, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class _IdPool:
+    """
+    Random bytes for identifiers, drawn from one os.urandom() call per 4 KiB.
+    
+    IDs only need to be unique, not secret; pooling avoids a syscall and a
+    UUID object per transition.
+    """
+    
+    def __init__(self, size: int = 4096):
+        self._size = size
+        self._reset()
+    
+    def _reset(self) -> None:
+        # Also used after fork so parent and child never share a buffer
+        self._lock = threading.Lock()
+        self._buf = b''
+        self._pos = 0
+    
+    def take(self, n: int) -> bytes:
+        with self._lock:
+            if self._pos + n > len(self._buf):
+                self._buf = os.urandom(self._size)
+                self._pos = 0
+            start = self._pos
+            self._pos += n
+            return self._buf[start:self._pos]
+
+
+_ID_POOL = _IdPool()
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_ID_POOL._reset)
+
+
+def _new_uuid4() -> str:
+    """Random version 4 UUID string, formatted like str(uuid.uuid4())."""
+    h = _ID_POOL.take(16).hex()
+    variant = "89ab"[int(h[16], 16) & 3]
+    return f"{h[:8]}-{h[8:12]}-4{h[13:16]}-{variant}{h[17:20]}-{h[20:]}"
+
+
+def _new_checkpoint_id() -> str:
+    """Checkpoint identifier: 'chk-' plus 8 random hex digits."""
+    return f"chk-{_ID_POOL.take(4).hex()}"
+
+
+# (epoch second, "YYYY-MM-DDTHH:MM:SS") of the last formatted timestamp
+_iso_second_prefix = (None, "")
+
+
+def _iso_from_ns(epoch_ns: int) -> str:
+    """
+    Format Unix epoch nanoseconds as ISO 8601 UTC with a 'Z' suffix.
+    
+    The date and time up to the second are formatted once per second and
+    reused; only the microseconds are formatted on each call.
+    """
+    global _iso_second_prefix
+    seconds, nanos = divmod(epoch_ns, 1_000_000_000)
+    cached_second, prefix = _iso_second_prefix
+    if seconds != cached_second:
+        prefix = f"{datetime.fromtimestamp(seconds, tz=timezone.utc):%Y-%m-%dT%H:%M:%S}"
+        _iso_second_prefix = (seconds, prefix)
+    return f"{prefix}.{nanos // 1000:06d}Z"
+
+
+def _append_bytes(path: Path, data: bytes, durable: bool = False) -> None:
+    """
+    Append data to a file with one unbuffered O_APPEND write.
+    
+    The parent directory is created if it has been removed.
+    """
+    flags = os.O_WRONLY | os.O_APPEND | os.O_CREAT
+    try:
+        fd = os.open(path, flags, 0o666)
+    except FileNotFoundError:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(path, flags, 0o666)
+    try:
+        _write_all(fd, data)
+        if durable:
+            os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _utcnow_iso() -> str:
+    """
+    Current UTC time as ISO 8601 with microseconds and a 'Z' suffix.
+    
+    Replaces the deprecated ``datetime.utcnow().isoformat() + 'Z'``; the
+    fraction is always present, so timestamps have a fixed width.
+    """
+    return _iso_from_ns(time.time_ns())
+
+
+def _json_string_probe(value: Optional[str]) -> Optional[bytes]:
+    """
+    Bytes every JSON encoding of the string ``value`` contains, or None.
+    
+    Only plain printable ASCII without quotes or backslashes is encoded the
+    same by every writer (orjson, json with or without ensure_ascii), so a
+    line lacking the probe cannot contain the value.
+    """
+    if not value or not value.isascii() or not value.isprintable() or '"' in value or '\\' in value:
+        return None
+    return b'"' + value.encode('ascii') + b'"'
+
+
+# Block size for reading JSONL files backwards from the end
+REVERSE_READ_BLOCK_SIZE = 64 * 1024
+
+
+def _iter_lines_reversed(path: Path, block_size: Optional[int] = None):
+    """
+    Yield the non-empty, newline-terminated lines of a file from last to first.
+    
+    Reads fixed-size blocks backwards from EOF, so only the tail of the
+    file is touched when the caller stops early. Text after the last
+    newline is an append in progress (or a truncated write) and is skipped,
+    as _read_jsonl does.
+    """
+    if block_size is None:
+        block_size = REVERSE_READ_BLOCK_SIZE
+    with open(path, 'rb') as f:
+        pos = f.seek(0, os.SEEK_END)
+        remainder = b''
+        at_tail = True
+        while pos > 0:
+            step = min(block_size, pos)
+            pos -= step
+            f.seek(pos)
+            block = f.read(step) + remainder
+            lines = block.split(b'\n')
+            # First piece may be a partial line; carry it into the next block
+            remainder = lines[0]
+            for line in reversed(lines[1:]):
+                if at_tail:
+                    # Piece after the last newline: empty or incomplete
+                    at_tail = False
+                elif line.strip():
+                    yield line
+        if not at_tail and remainder.strip():
+            yield remainder
+
+
+# Live managers, so buffered transitions are written out at interpreter exit
+_LIVE_MANAGERS = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_all_managers() -> None:
+    for manager in list(_LIVE_MANAGERS):
+        # One failing manager must not keep the others from flushing
+        try:
+            manager.flush()
+        except Exception as e:
+            logger.warning("Could not flush transitions at exit: %s", e)
+
+
+def _reset_writers_after_fork() -> None:
+    # Writer threads do not survive fork and the parent still owns its
+    # buffered transitions; the child starts with empty writer state. Locks
+    # may have been held by parent threads, and filelock refuses inherited
+    # FileLock objects, so the child creates its own
+    for manager in list(_LIVE_MANAGERS):
+        manager._reset_writer_state()
+        manager._reset_locks()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_writers_after_fork)
+
 
 class StateManager:
     """Manages persistent JSON state for SOMAS pipeline projects."""
     
-    def __init__(self, projects_dir: Path = None, config_path: Path = None):
+    def __init__(
+        self,
+        projects_dir: Path = None,
+        config_path: Path = None,
+        cache_enabled: bool = True,
+        single_writer: bool = False
+    ):
         """
         Initialize state manager.
         
         Args:
             projects_dir: Root directory for projects (default: .somas/projects)
             config_path: Path to config file (default: .somas/config.yml)
+            cache_enabled: Keep in-memory copies of state and log files between
+                calls (always revalidated against the files); disable to read
+                from disk on every call
+            single_writer: This manager is the only writer of its projects
+                (one process, one StateManager), so cross-process file locks
+                are skipped and only in-process locks are taken
         """
         if projects_dir is None:
             projects_dir = Path(".somas/projects")
@@ -63,9 +414,49 @@ class StateManager:
         if config_path is None:
             config_path = Path(".somas/config.yml")
         self.config_path = Path(config_path)
+        self.cache_enabled = cache_enabled
+        self.single_writer = single_writer
+        
+        # Open batch() blocks: project_id -> {"owner", "state", "durable"}
+        self._batches: Dict[str, Dict[str, Any]] = {}
         
         # Lazy-loaded configuration
         self._max_checkpoints = None
+        
+        self._reset_writer_state()
+        _LIVE_MANAGERS.add(self)
+        
+        # Raw bytes of JSON files last read or written, validated by stat:
+        # str(path) -> ((st_ino, st_mtime_ns, st_size), payload)
+        self._file_cache: Dict[str, tuple] = {}
+        
+        # Parsed entries of append-only JSONL files:
+        # str(path) -> (st_ino, parsed_offset, bytes_before_offset, entries)
+        self._jsonl_cache: Dict[str, tuple] = {}
+        
+        # Dead letter positions by stage, agent and unrecovered, per project
+        self._dead_letter_indexes: Dict[str, Dict[str, Any]] = {}
+        
+        # Projects whose legacy dead_letters.json has been checked for migration
+        self._migrated_dead_letters: set = set()
+        
+        # Transition positions by event type and stage, per project
+        self._transition_indexes: Dict[str, Dict[str, Any]] = {}
+        
+        # get_dead_letters results per project, LRU ordered:
+        # query -> (file stat keys, entries)
+        self._dead_letter_queries: Dict[str, OrderedDict] = {}
+        
+        # (projects_dir, resolved projects_dir), see _get_safe_project_path
+        self._resolved_projects_dir = None
+        
+        # Resolved project file paths: (projects_dir, project_id, name) -> Path
+        self._project_files: Dict[tuple, Path] = {}
+        
+        # Directories already created by _ensure_dir
+        self._created_dirs: set = set()
+        
+        self._reset_locks()
     
     def _get_max_checkpoints(self) -> int:
         """
@@ -78,33 +469,48 @@ class StateManager:
         if self._max_checkpoints is not None:
             return self._max_checkpoints
         
-        if self.config_path.exists():
+        try:
+            st = os.stat(self.config_path)
+        except (FileNotFoundError, NotADirectoryError):
+            st = None
+        
+        if st is not None:
             try:
-                with open(self.config_path) as f:
-                    config = yaml.safe_load(f) or {}
-                    self._max_checkpoints = config.get("state_manager", {}).get("max_checkpoints", DEFAULT_MAX_CHECKPOINTS)
-                    return self._max_checkpoints
+                self._max_checkpoints = _load_max_checkpoints(
+                    os.path.abspath(self.config_path), st.st_mtime_ns, st.st_size
+                )
+                return self._max_checkpoints
             except (yaml.YAMLError, IOError, PermissionError) as e:
                 # If config is invalid or can't be read, use default
                 # Log the error but don't fail
-                print(f"Warning: Could not load max_checkpoints from config: {e}", file=sys.stderr)
+                logger.warning("Could not load max_checkpoints from config: %s", e)
                 self._max_checkpoints = DEFAULT_MAX_CHECKPOINTS
                 return self._max_checkpoints
         
         self._max_checkpoints = DEFAULT_MAX_CHECKPOINTS
         return self._max_checkpoints
         
-    def _validate_project_id(self, project_id: str) -> bool:
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def _validate_project_id(project_id: str) -> bool:
         """
         Validate project ID to prevent path traversal attacks.
         
+        Successful validations are memoized; invalid IDs always raise.
+        
         Args:
             project_id: Project identifier to validate
             
         Returns:
             True if valid, raises ValueError otherwise
         """
-        if not re.match(r'^project-\d+$', project_id):
+        # Plain string checks; isdecimal() also rejects signs, spaces and newlines
+        if not (
+            type(project_id) is str
+            and project_id.startswith(_PROJECT_ID_PREFIX)
+            and len(project_id) > len(_PROJECT_ID_PREFIX)
+            and project_id[len(_PROJECT_ID_PREFIX):].isdecimal()
+        ):
             raise ValueError(f"Invalid project ID format: {project_id}")
         return True
     
@@ -149,7 +555,12 @@ class StateManager:
         """
         self._validate_project_id(project_id)
         
-        base_path = Path(self.projects_dir).resolve()
+        # Resolve the projects directory once per projects_dir value
+        resolved = self._resolved_projects_dir
+        if resolved is None or resolved[0] != self.projects_dir:
+            resolved = (self.projects_dir, Path(self.projects_dir).resolve())
+            self._resolved_projects_dir = resolved
+        base_path = resolved[1]
         project_path = (base_path / project_id).resolve()
         
         # Verify path stays within base directory using pathlib's relative_to
@@ -162,17 +573,230 @@ class StateManager:
         
         return project_path
     
+    def _project_file(self, project_id: str, name: str) -> Path:
+        """
+        Get the path of a file in a project directory, memoized per manager.
+        
+        Resolving the project directory touches the filesystem, so paths are
+        kept per (projects_dir, project_id, name). Only valid project IDs are
+        cached; invalid ones raise on every call.
+        """
+        key = (self.projects_dir, project_id, name)
+        path = self._project_files.get(key)
+        if path is None:
+            path = self._get_project_dir(project_id) / name
+            self._project_files[key] = path
+        return path
+    
     def _get_state_path(self, project_id: str) -> Path:
         """Get path to state.json file."""
-        return self._get_project_dir(project_id) / "state.json"
+        return self._project_file(project_id, "state.json")
     
     def _get_dead_letters_path(self, project_id: str) -> Path:
-        """Get path to dead_letters.json file."""
-        return self._get_project_dir(project_id) / "dead_letters.json"
+        """Get path to dead_letters.jsonl file."""
+        return self._project_file(project_id, "dead_letters.jsonl")
+    
+    def _get_dead_letter_stats_path(self, project_id: str) -> Path:
+        """Get path to dead_letters.stats.json file."""
+        return self._project_file(project_id, "dead_letters.stats.json")
+    
+    def _get_legacy_dead_letters_path(self, project_id: str) -> Path:
+        """Get path to the pre-JSONL dead_letters.json file (read-only)."""
+        return self._project_file(project_id, "dead_letters.json")
     
     def _get_transitions_path(self, project_id: str) -> Path:
         """Get path to transitions.jsonl file."""
-        return self._get_project_dir(project_id) / "transitions.jsonl"
+        return self._project_file(project_id, "transitions.jsonl")
+    
+    def _ensure_dir(self, path: Path) -> None:
+        """Create the parent directory of ``path`` once per manager."""
+        parent = path.parent
+        if parent not in self._created_dirs:
+            parent.mkdir(parents=True, exist_ok=True)
+            self._created_dirs.add(parent)
+    
+    @contextmanager
+    def _lock(self, path: Path):
+        """
+        Hold the lock for a state file, both in-process and cross-process.
+        
+        Threads of this process queue on a reentrant threading.RLock (no
+        polling), and only the holder takes the file lock shared with other
+        processes. Lock objects are created once per path and reused. A
+        ``single_writer`` manager skips the file lock.
+        
+        Args:
+            path: File being protected (the lock file is ``{path}.lock``)
+        """
+        key = str(path)
+        locks = self._locks.get(key)
+        if locks is None:
+            with self._locks_guard:
+                locks = self._locks.get(key)
+                if locks is None:
+                    file_lock = None
+                    if not self.single_writer:
+                        file_lock = FileLock(f"{key}.lock", timeout=LOCK_TIMEOUT)
+                    locks = (threading.RLock(), file_lock)
+                    self._locks[key] = locks
+        
+        rlock, file_lock = locks
+        with rlock:
+            if file_lock is None:
+                yield
+            else:
+                with file_lock:
+                    yield
+    
+    def _read_file_bytes(self, path: Path) -> bytes:
+        """
+        Read a JSON file's bytes, reusing the cached copy if it is unchanged.
+        
+        The cache is validated against inode, mtime and size, so writes by
+        other processes (which replace the file) are always seen. Parsing
+        the cached bytes yields a fresh object for every caller.
+        
+        Args:
+            path: File to read
+            
+        Returns:
+            File contents
+        """
+        key = str(path)
+        if self.cache_enabled:
+            st = os.stat(key)
+            cached = self._file_cache.get(key)
+            if cached is not None and cached[0] == (st.st_ino, st.st_mtime_ns, st.st_size):
+                return cached[1]
+        
+        # Unbuffered read sized from fstat: one read syscall for the whole file
+        fd = os.open(key, os.O_RDONLY)
+        try:
+            st = os.fstat(fd)
+            payload = _read_at(fd, 0, st.st_size)
+        finally:
+            os.close(fd)
+        if self.cache_enabled:
+            self._file_cache[key] = ((st.st_ino, st.st_mtime_ns, st.st_size), payload)
+        return payload
+    
+    def _remember_file(self, path: Path, payload: bytes) -> None:
+        """Record bytes just written to path so the next read skips the disk."""
+        if not self.cache_enabled:
+            return
+        key = str(path)
+        try:
+            st = os.stat(key)
+        except OSError:
+            self._file_cache.pop(key, None)
+            return
+        self._file_cache[key] = ((st.st_ino, st.st_mtime_ns, st.st_size), payload)
+    
+    def _read_jsonl(self, path: Path) -> List[Dict[str, Any]]:
+        """
+        Read the complete entries of a JSONL file, parsing only new lines.
+        
+        Parsed entries are cached per path. If the file has only been
+        appended to since the last read (same inode, and the bytes just
+        before the parsed offset are unchanged) only the new bytes are
+        parsed; any other change re-reads the whole file. A trailing line
+        without its newline (an append in progress) is left for a later read.
+        
+        The returned list is new, but the entry dicts are shared with the
+        cache and must not be modified.
+        
+        Args:
+            path: JSONL file path
+            
+        Returns:
+            Parsed entries in file order
+        """
+        key = str(path)
+        fd = os.open(key, os.O_RDONLY)
+        try:
+            st = os.fstat(fd)
+            entries = []
+            offset = 0
+            tail = b''
+            
+            cached = self._jsonl_cache.get(key)
+            if cached is not None:
+                ino, cached_offset, cached_tail, cached_entries = cached
+                if (
+                    ino == st.st_ino
+                    and cached_offset <= st.st_size
+                    and _read_at(fd, cached_offset - len(cached_tail), len(cached_tail)) == cached_tail
+                ):
+                    if cached_offset == st.st_size:
+                        return list(cached_entries)
+                    entries = list(cached_entries)
+                    offset = cached_offset
+                    tail = cached_tail
+            
+            data = _read_at(fd, offset, st.st_size - offset)
+        finally:
+            os.close(fd)
+        
+        # Parse complete lines only, without copying when there is no partial line
+        end = data.rfind(b'\n') + 1
+        for line in (data if end == len(data) else data[:end]).splitlines():
+            if line.strip():
+                entry = _load_bytes(line)
+                for field in _INTERNED_FIELDS:
+                    value = entry.get(field)
+                    if type(value) is str:
+                        entry[field] = sys.intern(value)
+                entries.append(entry)
+        
+        if end:
+            tail = (tail + data[:end])[-64:]
+        if self.cache_enabled:
+            self._jsonl_cache[key] = (st.st_ino, offset + end, tail, entries)
+        return list(entries)
+    
+    def _write_json_locked(self, path: Path, data: Dict[str, Any], durable: bool = False) -> None:
+        """
+        Atomically replace a JSON file; the caller must hold its lock.
+        
+        The serialized document is written with a single raw write and
+        renamed into place, so readers never see a partial file. With
+        ``durable`` the data and the rename are also fsync'd, which is
+        reserved for checkpoints. The parent directory is only created if
+        writing the temporary file fails because it is missing.
+        
+        Args:
+            path: Target file path
+            data: Data to write
+            durable: Whether the write must survive a crash once this returns
+        """
+        payload = _dump_bytes(data)
+        self._write_bytes_locked(path, payload, durable)
+        self._remember_file(path, payload)
+    
+    def _write_bytes_locked(self, path: Path, payload: bytes, durable: bool = False) -> None:
+        """Atomically replace a file's contents; see _write_json_locked."""
+        tmp_path = path.with_suffix('.tmp')
+        flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC
+        try:
+            try:
+                fd = os.open(tmp_path, flags, 0o666)
+            except FileNotFoundError:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                fd = os.open(tmp_path, flags, 0o666)
+            try:
+                _write_all(fd, payload)
+                if durable:
+                    # Data must be on disk before the rename makes it visible
+                    os.fsync(fd)
+            finally:
+                os.close(fd)
+            tmp_path.replace(path)
+            if durable:
+                _fsync_dir(path.parent)
+        except Exception:
+            if tmp_path.exists():
+                tmp_path.unlink()
+            raise
     
     def _atomic_write_json(self, path: Path, data: Dict[str, Any]) -> None:
         """
@@ -182,21 +806,11 @@ class StateManager:
             path: Target file path
             data: Data to write
         """
-        path.parent.mkdir(parents=True, exist_ok=True)
+        self._ensure_dir(path)
         
         # Use file locking to prevent concurrent writes
-        lock_path = f"{path}.lock"
-        with FileLock(lock_path, timeout=30):
-            tmp_path = path.with_suffix('.tmp')
-            
-            try:
-                with open(tmp_path, 'w') as f:
-                    json.dump(data, f, indent=2)
-                tmp_path.replace(path)
-            except Exception as e:
-                if tmp_path.exists():
-                    tmp_path.unlink()
-                raise
+        with self._lock(path):
+            self._write_json_locked(path, data)
     
     def _append_jsonl(self, path: Path, entry: Dict[str, Any]) -> None:
         """
@@ -206,14 +820,137 @@ class StateManager:
             path: JSONL file path
             entry: Entry to append
         """
-        path.parent.mkdir(parents=True, exist_ok=True)
+        self._append_jsonl_lines(path, [_dump_line(entry)])
+    
+    def _append_jsonl_lines(self, path: Path, lines: List[bytes], durable: bool = False) -> None:
+        """
+        Append pre-encoded JSONL lines to a file with a single lock acquisition.
+        
+        A ``single_writer`` manager appends payloads of at most
+        ATOMIC_APPEND_MAX_BYTES without taking the lock. Appends are left to
+        the OS page cache unless ``durable`` is set.
+        
+        Args:
+            path: JSONL file path
+            lines: Newline-terminated encoded entries
+            durable: fsync the file after appending
+        """
+        self._ensure_dir(path)
+        data = b''.join(lines)
+        
+        # Other writers may share the file unless single_writer is set;
+        # O_APPEND alone does not keep their writes from interleaving
+        if self.single_writer and len(data) <= ATOMIC_APPEND_MAX_BYTES:
+            _append_bytes(path, data, durable)
+            return
         
         # Use file locking to prevent concurrent appends
-        lock_path = f"{path}.lock"
-        with FileLock(lock_path, timeout=30):
-            with open(path, 'a') as f:
-                json.dump(entry, f)
-                f.write('\n')
+        with self._lock(path):
+            _append_bytes(path, data, durable)
+    
+    def _reset_writer_state(self) -> None:
+        """Start with no buffered transitions, fresh locks and no writer thread."""
+        # Buffered transitions: path -> encoded JSONL lines awaiting flush
+        self._pending_transitions: Dict[Path, List[bytes]] = {}
+        self._pending_bytes = 0
+        self._pending_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._writer_wakeup = threading.Event()
+        self._writer_thread = None
+    
+    def _reset_locks(self) -> None:
+        """Create the per-path file locks and the cache guard locks afresh."""
+        # Per-path locks: in-process RLock plus a cached cross-process FileLock
+        self._locks: Dict[str, tuple] = {}
+        self._locks_guard = threading.Lock()
+        self._dead_letter_indexes_lock = threading.Lock()
+        self._dead_letter_queries_lock = threading.Lock()
+        self._transition_indexes_lock = threading.Lock()
+    
+    def _queue_transition(self, path: Path, line: bytes) -> None:
+        """
+        Buffer an encoded transition for the background writer.
+        
+        Args:
+            path: transitions.jsonl path
+            line: Encoded JSONL entry
+        """
+        with self._pending_lock:
+            self._pending_transitions.setdefault(path, []).append(line)
+            self._pending_bytes += len(line)
+            flush_now = self._pending_bytes >= MAX_PENDING_TRANSITION_BYTES
+            if not flush_now and self._writer_thread is None:
+                self._writer_thread = threading.Thread(
+                    target=self._run_writer, name="somas-transition-writer", daemon=True
+                )
+                self._writer_thread.start()
+        
+        if flush_now:
+            self.flush()
+        else:
+            self._writer_wakeup.set()
+    
+    def _run_writer(self) -> None:
+        """
+        Background writer: append buffered transitions in batches.
+        
+        One thread per manager, started on demand. After a wakeup it waits
+        TRANSITION_FLUSH_INTERVAL so a burst of transitions is written with a
+        single lock acquisition and write, and it exits once idle for
+        TRANSITION_WRITER_IDLE_TIMEOUT.
+        """
+        while True:
+            if self._writer_wakeup.wait(TRANSITION_WRITER_IDLE_TIMEOUT):
+                self._writer_wakeup.clear()
+                time.sleep(TRANSITION_FLUSH_INTERVAL)
+            else:
+                with self._pending_lock:
+                    if not self._pending_transitions:
+                        self._writer_thread = None
+                        return
+                # Transitions left over from a failed flush: retry them
+            
+            try:
+                self.flush()
+            except Exception as e:
+                logger.warning("Could not flush transitions: %s", e)
+    
+    def flush(self, durable: bool = False) -> None:
+        """
+        Write all buffered transitions to their transitions.jsonl files.
+        
+        Called automatically shortly after logging, before reads and at
+        interpreter exit; call it explicitly before handing files to
+        another process. If an append fails, the unwritten transitions are
+        put back in the buffer ahead of newer ones and the error is raised.
+        
+        Args:
+            durable: Also fsync the written files
+        """
+        # Serialize flushes so batches reach disk in the order they were logged
+        with self._flush_lock:
+            with self._pending_lock:
+                pending = self._pending_transitions
+                self._pending_transitions = {}
+                self._pending_bytes = 0
+            
+            batches = list(pending.items())
+            for position, (path, lines) in enumerate(batches):
+                try:
+                    self._append_jsonl_lines(path, lines, durable=durable)
+                except BaseException:
+                    self._requeue_transitions(batches[position:])
+                    raise
+    
+    def _requeue_transitions(self, batches: List[tuple]) -> None:
+        """Put unwritten (path, lines) batches back ahead of newer transitions."""
+        requeued_bytes = sum(len(line) for _, lines in batches for line in lines)
+        with self._pending_lock:
+            requeued = dict(batches)
+            for path, lines in self._pending_transitions.items():
+                requeued.setdefault(path, []).extend(lines)
+            self._pending_transitions = requeued
+            self._pending_bytes += requeued_bytes
     
     def initialize_project(
         self,
@@ -242,9 +979,9 @@ class StateManager:
             branch = f"somas/{project_id}"
         
         if labels is None:
-            labels = ["somas-project", "somas:dev"]
+            labels = list(_DEFAULT_LABELS)
         
-        now = datetime.utcnow().isoformat() + 'Z'
+        now = _utcnow_iso()
         
         # Initialize state.json
         state = {
@@ -256,10 +993,7 @@ class StateManager:
             "branch": branch,
             "current_stage": "intake",
             "status": "initializing",
-            "stages": {
-                stage: {"status": "pending", "retry_count": 0}
-                for stage in VALID_STAGES
-            },
+            "stages": {stage: dict(_DEFAULT_STAGE_TEMPLATE) for stage in VALID_STAGES},
             "checkpoints": [],
             "labels": {
                 "github": labels,
@@ -280,23 +1014,9 @@ class StateManager:
             }
         }
         
-        # Initialize dead_letters.json
-        dead_letters = {
-            "project_id": project_id,
-            "version": "1.0.0",
-            "entries": [],
-            "statistics": {
-                "total_entries": 0,
-                "by_stage": {},
-                "by_agent": {},
-                "recovered": 0,
-                "unrecovered": 0
-            }
-        }
-        
         # Write initial state files
         self._atomic_write_json(self._get_state_path(project_id), state)
-        self._atomic_write_json(self._get_dead_letters_path(project_id), dead_letters)
+        self._reset_dead_letters(project_id)
         
         # Log initialization transition
         self.log_transition(
@@ -309,6 +1029,8 @@ class StateManager:
             },
             labels={"current": labels}
         )
+        # Make sure all three project files exist once this returns
+        self.flush()
         
         return state
     
@@ -322,12 +1044,82 @@ class StateManager:
         Returns:
             State dictionary
         """
+        batch = self._batches.get(project_id)
+        if batch is not None and batch["owner"] == threading.get_ident():
+            # Inside our own batch(): return a copy of the pending state
+            return _copy_json(batch["state"])
+        
         state_path = self._get_state_path(project_id)
-        if not state_path.exists():
-            raise FileNotFoundError(f"State file not found: {state_path}")
+        try:
+            payload = self._read_file_bytes(state_path)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"State file not found: {state_path}") from None
         
-        with open(state_path, 'r') as f:
-            return json.load(f)
+        return _load_bytes(payload)
+    
+    @contextmanager
+    def batch(self, project_id: str):
+        """
+        Coalesce the state.json writes of several calls into one.
+        
+        Holds the project's state lock for the whole block. Mutating methods
+        called from this thread inside the block update one in-memory state,
+        which is written once when the block exits (also on error), fsync'd
+        if any of the calls needed a durable write. Buffered transitions are
+        flushed afterwards; dead letters are still written as they happen.
+        Inside the block, get_state() returns a copy of the pending state,
+        while mutating methods return the working copy itself.
+        
+        Example::
+        
+            with state_manager.batch("project-1"):
+                state_manager.start_stage("project-1", "specify", "specifier")
+                state_manager.complete_stage("project-1", "specify")
+        
+        Args:
+            project_id: Project identifier
+        """
+        state_path = self._get_state_path(project_id)
+        with self._lock(state_path):
+            if project_id in self._batches:
+                # Nested batch: the outermost one writes
+                yield
+                return
+            
+            batch = {
+                "owner": threading.get_ident(),
+                "state": self.get_state(project_id),
+                "durable": False
+            }
+            self._batches[project_id] = batch
+            try:
+                yield
+            finally:
+                del self._batches[project_id]
+                self._write_json_locked(state_path, batch["state"], durable=batch["durable"])
+        
+        self.flush()
+    
+    def _state_for_update(self, project_id: str) -> Dict[str, Any]:
+        """Get the state to modify; the caller must hold the state lock."""
+        batch = self._batches.get(project_id)
+        if batch is not None:
+            return batch["state"]
+        return self.get_state(project_id)
+    
+    def _save_state(
+        self,
+        project_id: str,
+        state_path: Path,
+        state: Dict[str, Any],
+        durable: bool = False
+    ) -> None:
+        """Write modified state, or defer it to the enclosing batch()."""
+        batch = self._batches.get(project_id)
+        if batch is not None:
+            batch["durable"] = batch["durable"] or durable
+            return
+        self._write_json_locked(state_path, state, durable=durable)
     
     def update_state(
         self,
@@ -338,6 +1130,9 @@ class StateManager:
         """
         Update project state with file locking for concurrent safety.
         
+        If ``updates`` leaves the state unchanged, state.json is not
+        rewritten and ``updated_at`` keeps its value.
+        
         Args:
             project_id: Project identifier
             updates: Dictionary of updates to apply
@@ -349,27 +1144,21 @@ class StateManager:
         state_path = self._get_state_path(project_id)
         
         # Use file locking for the entire read-modify-write operation
-        with FileLock(f"{state_path}.lock", timeout=30):
-            state = self.get_state(project_id)
+        with self._lock(state_path):
+            state = self._state_for_update(project_id)
             
             # Store old values for transition logging
             old_status = state.get("status")
             old_stage = state.get("current_stage")
             
-            # Apply updates
-            state.update(updates)
-            state["updated_at"] = datetime.utcnow().isoformat() + 'Z'
-
-            # Perform atomic write while lock is held (inline, same as other methods)
-            tmp_path = state_path.with_suffix('.tmp')
-            try:
-                with open(tmp_path, 'w') as f:
-                    json.dump(state, f, indent=2)
-                tmp_path.replace(state_path)
-            except Exception as e:
-                if tmp_path.exists():
-                    tmp_path.unlink()
-                raise
+            # Skip the write when every update matches the stored value;
+            # callers often re-send the current status defensively
+            if any(key not in state or state[key] != value for key, value in updates.items()):
+                state.update(updates)
+                state["updated_at"] = _utcnow_iso()
+                
+                # Perform atomic write while lock is held
+                self._save_state(project_id, state_path, state)
         
         # Log transition if requested (outside the lock)
         if log_transition:
@@ -406,9 +1195,10 @@ class StateManager:
         state_path = self._get_state_path(project_id)
         
         # Use file locking for the entire read-modify-write operation
-        with FileLock(f"{state_path}.lock", timeout=30):
-            state = self.get_state(project_id)
-            now = datetime.utcnow().isoformat() + 'Z'
+        with self._lock(state_path):
+            state = self._state_for_update(project_id)
+            now_ns = time.time_ns()
+            now = _iso_from_ns(now_ns)
             
             # Update stage status
             if "stages" not in state:
@@ -419,6 +1209,7 @@ class StateManager:
             state["stages"][stage].update({
                 "status": "in_progress",
                 "started_at": now,
+                "started_at_ns": now_ns,
                 "agent": agent
             })
             
@@ -428,20 +1219,10 @@ class StateManager:
             state["updated_at"] = now
             
             # Increment agent invocation count
-            if "metrics" not in state:
-                state["metrics"] = {}
-            state["metrics"]["agent_invocations"] = state["metrics"].get("agent_invocations", 0) + 1
+            _increment_metric(state, "agent_invocations")
             
             # Write directly (we already have the lock)
-            tmp_path = state_path.with_suffix('.tmp')
-            try:
-                with open(tmp_path, 'w') as f:
-                    json.dump(state, f, indent=2)
-                tmp_path.replace(state_path)
-            except Exception as e:
-                if tmp_path.exists():
-                    tmp_path.unlink()
-                raise
+            self._save_state(project_id, state_path, state)
         
         # Log transition (outside the lock)
         self.log_transition(
@@ -464,6 +1245,9 @@ class StateManager:
         """
         Mark a pipeline stage as completed with file locking for concurrent safety.
         
+        The stage update and the optional checkpoint are applied in a single
+        locked read-modify-write.
+        
         Args:
             project_id: Project identifier
             stage: Stage name
@@ -476,17 +1260,22 @@ class StateManager:
         state_path = self._get_state_path(project_id)
         
         # Use file locking for the entire read-modify-write operation
-        with FileLock(f"{state_path}.lock", timeout=30):
-            state = self.get_state(project_id)
-            now = datetime.utcnow().isoformat() + 'Z'
+        with self._lock(state_path):
+            state = self._state_for_update(project_id)
+            now_ns = time.time_ns()
+            now = _iso_from_ns(now_ns)
             
-            # Calculate duration
+            # Calculate duration (integer math; parse ISO only for state
+            # written before started_at_ns was recorded)
             stage_info = state.get("stages", {}).get(stage, {})
+            started_at_ns = stage_info.get("started_at_ns")
             started_at = stage_info.get("started_at")
             duration = 0
-            if started_at:
+            if started_at_ns is not None:
+                duration = (now_ns - started_at_ns) / 1e9
+            elif started_at:
                 start_time = datetime.fromisoformat(started_at.replace('Z', '+00:00'))
-                end_time = datetime.fromisoformat(now.replace('Z', '+00:00'))
+                end_time = datetime.fromtimestamp(now_ns / 1e9, tz=timezone.utc)
                 duration = (end_time - start_time).total_seconds()
             
             # Update stage status
@@ -498,36 +1287,31 @@ class StateManager:
             })
             
             # Update metrics
-            if "stage_durations" not in state["metrics"]:
-                state["metrics"]["stage_durations"] = {}
-            state["metrics"]["stage_durations"][stage] = duration
-            state["metrics"]["artifacts_generated"] = state["metrics"].get("artifacts_generated", 0) + len(artifacts or [])
+            metrics = state.setdefault("metrics", {})
+            metrics.setdefault("stage_durations", {})[stage] = duration
+            _increment_metric(state, "artifacts_generated", len(artifacts or []))
+            
+            # Add the checkpoint to the same state write
+            checkpoint = None
+            if create_checkpoint:
+                checkpoint = self._add_checkpoint(state, stage, "success", artifacts, None, now)
             
-            # Write state
+            # Write state (fsync'd when it carries a checkpoint)
             state["updated_at"] = now
-            tmp_path = state_path.with_suffix('.tmp')
-            try:
-                with open(tmp_path, 'w') as f:
-                    json.dump(state, f, indent=2)
-                tmp_path.replace(state_path)
-            except Exception as e:
-                if tmp_path.exists():
-                    tmp_path.unlink()
-                raise
+            self._save_state(project_id, state_path, state, durable=checkpoint is not None)
         
-        # Create checkpoint if requested (outside the lock to avoid nested locking)
+        # Log transitions (outside lock)
         checkpoint_id = None
-        if create_checkpoint:
-            checkpoint_id = self.create_checkpoint(
+        if checkpoint is not None:
+            checkpoint_id = checkpoint["id"]
+            self.log_transition(
                 project_id=project_id,
+                event_type="checkpoint_created",
                 stage=stage,
-                status="success",
-                artifacts=artifacts
+                checkpoint_id=checkpoint_id,
+                metadata=checkpoint
             )
-            # Reload state to get updated checkpoint
-            state = self.get_state(project_id)
         
-        # Log transition (outside lock)
         self.log_transition(
             project_id=project_id,
             event_type="stage_completed",
@@ -554,6 +1338,9 @@ class StateManager:
         """
         Mark a pipeline stage as failed with file locking for concurrent safety.
         
+        The dead letter is recorded while the state lock is held, and the
+        stage failure and dead letter count are written to state once.
+        
         Args:
             project_id: Project identifier
             stage: Stage name
@@ -568,9 +1355,9 @@ class StateManager:
         state_path = self._get_state_path(project_id)
         
         # Use file locking for the entire read-modify-write operation
-        with FileLock(f"{state_path}.lock", timeout=30):
-            state = self.get_state(project_id)
-            now = datetime.utcnow().isoformat() + 'Z'
+        with self._lock(state_path):
+            state = self._state_for_update(project_id)
+            now = _utcnow_iso()
             
             # Update stage status
             retry_count = state["stages"][stage].get("retry_count", 0)
@@ -584,32 +1371,28 @@ class StateManager:
             state["status"] = "failed"
             state["updated_at"] = now
             
-            # Write state (before dead letter)
-            tmp_path = state_path.with_suffix('.tmp')
-            try:
-                with open(tmp_path, 'w') as f:
-                    json.dump(state, f, indent=2)
-                tmp_path.replace(state_path)
-            except Exception as e:
-                if tmp_path.exists():
-                    tmp_path.unlink()
-                raise
-        
-        # Create dead letter if requested (outside the lock)
-        dead_letter_id = None
-        if create_dead_letter:
-            dead_letter_id = self.add_dead_letter(
-                project_id=project_id,
-                stage=stage,
-                agent=agent,
-                error=error,
-                context=context,
-                attempt_number=retry_count + 1
-            )
-            # Reload state to get updated metrics
-            state = self.get_state(project_id)
+            # Record dead letter with the failed state in hand
+            dead_letter_id = None
+            if create_dead_letter:
+                dead_letter_id = self._record_dead_letter_locked(
+                    project_id=project_id,
+                    state=state,
+                    stage=stage,
+                    agent=agent,
+                    error=error,
+                    context=context,
+                    request=None,
+                    trace=None,
+                    attempt_number=retry_count + 1,
+                    now=now
+                )
+            
+            self._save_state(project_id, state_path, state)
+        
+        # Log transitions (outside lock)
+        if dead_letter_id is not None:
+            self._log_error_recorded(project_id, stage, agent, error, dead_letter_id)
         
-        # Log transition (outside lock)
         self.log_transition(
             project_id=project_id,
             event_type="stage_failed",
@@ -624,6 +1407,54 @@ class StateManager:
         
         return state
     
+    def _add_checkpoint(
+        self,
+        state: Dict[str, Any],
+        stage: str,
+        status: str,
+        artifacts: Optional[List[str]],
+        metadata: Optional[Dict[str, Any]],
+        now: str
+    ) -> Dict[str, Any]:
+        """
+        Append a checkpoint to an in-memory state, applying rotation.
+        
+        Args:
+            state: State dictionary to modify (caller holds the state lock)
+            stage: Stage where checkpoint is created
+            status: Checkpoint status
+            artifacts: Artifacts at this checkpoint
+            metadata: Additional metadata
+            now: Timestamp for the checkpoint
+            
+        Returns:
+            The new checkpoint entry
+        """
+        checkpoint_id = _new_checkpoint_id()
+        checkpoint = {
+            "id": checkpoint_id,
+            "stage": stage,
+            "timestamp": now,
+            "status": status,
+            "artifacts": artifacts or [],
+            "metadata": metadata or {}
+        }
+        
+        # Add checkpoint to state
+        checkpoints = state.setdefault("checkpoints", [])
+        checkpoints.append(checkpoint)
+        
+        # ROTATION: Keep only the N most recent checkpoints (trimmed in place)
+        excess = len(checkpoints) - self._get_max_checkpoints()
+        if excess > 0:
+            del checkpoints[:excess]
+        
+        # Update recovery info
+        if status == "success":
+            state["recovery_info"]["last_successful_checkpoint"] = checkpoint_id
+        
+        return checkpoint
+    
     def create_checkpoint(
         self,
         project_id: str,
@@ -648,57 +1479,27 @@ class StateManager:
         state_path = self._get_state_path(project_id)
         
         # Use file locking for the entire read-modify-write operation
-        with FileLock(f"{state_path}.lock", timeout=30):
-            state = self.get_state(project_id)
-            now = datetime.utcnow().isoformat() + 'Z'
-            
-            checkpoint_id = f"chk-{uuid.uuid4().hex[:8]}"
-            checkpoint = {
-                "id": checkpoint_id,
-                "stage": stage,
-                "timestamp": now,
-                "status": status,
-                "artifacts": artifacts or [],
-                "metadata": metadata or {}
-            }
-            
-            # Add checkpoint to state
-            if "checkpoints" not in state:
-                state["checkpoints"] = []
-            state["checkpoints"].append(checkpoint)
-            
-            # ROTATION: Keep only the N most recent checkpoints
-            max_checkpoints = self._get_max_checkpoints()
-            if len(state["checkpoints"]) > max_checkpoints:
-                state["checkpoints"] = state["checkpoints"][-max_checkpoints:]
-            
-            # Update recovery info
-            if status == "success":
-                state["recovery_info"]["last_successful_checkpoint"] = checkpoint_id
+        with self._lock(state_path):
+            state = self._state_for_update(project_id)
+            now = _utcnow_iso()
             
+            checkpoint = self._add_checkpoint(state, stage, status, artifacts, metadata, now)
             state["updated_at"] = now
             
-            # Write directly (we already have the lock)
-            tmp_path = state_path.with_suffix('.tmp')
-            try:
-                with open(tmp_path, 'w') as f:
-                    json.dump(state, f, indent=2)
-                tmp_path.replace(state_path)
-            except Exception as e:
-                if tmp_path.exists():
-                    tmp_path.unlink()
-                raise
+            # Write directly (we already have the lock); checkpoints are the
+            # recovery points, so this write is fsync'd
+            self._save_state(project_id, state_path, state, durable=True)
         
         # Log transition (outside the lock)
         self.log_transition(
             project_id=project_id,
             event_type="checkpoint_created",
             stage=stage,
-            checkpoint_id=checkpoint_id,
+            checkpoint_id=checkpoint["id"],
             metadata=checkpoint
         )
         
-        return checkpoint_id
+        return checkpoint["id"]
     
     def add_dead_letter(
         self,
@@ -728,114 +1529,367 @@ class StateManager:
             Dead letter ID
         """
         state_path = self._get_state_path(project_id)
-        dead_letters_path = self._get_dead_letters_path(project_id)
-        state_path = self._get_state_path(project_id)
         
         # Use coordinated locking for both files to prevent race conditions
-        # Lock both files in consistent order to prevent deadlocks
-        state_lock = FileLock(f"{state_path}.lock", timeout=30)
-        dl_lock = FileLock(f"{dead_letters_path}.lock", timeout=30)
-        
-        with state_lock:
-            with dl_lock:
-                # Load existing dead letters
-                if dead_letters_path.exists():
-                    with open(dead_letters_path, 'r') as f:
-                        dead_letters = json.load(f)
-                else:
-                    dead_letters = {
-                        "project_id": project_id,
-                        "version": "1.0.0",
-                        "entries": [],
-                        "statistics": {
-                            "total_entries": 0,
-                            "by_stage": {},
-                            "by_agent": {},
-                            "recovered": 0,
-                            "unrecovered": 0
-                        }
-                    }
-                
-                # Create dead letter entry
-                dead_letter_id = str(uuid.uuid4())
-                now = datetime.utcnow().isoformat() + 'Z'
-                
-                # Get current state snapshot (load state once and reuse)
-                state_snapshot = {}
-                labels = {}
-                state = None
+        # (state lock first, then dead letters; see _record_dead_letter_locked)
+        with self._lock(state_path):
+            # Get current state snapshot (load state once and reuse)
+            state = None
+            try:
+                state = self._state_for_update(project_id)
+            except (FileNotFoundError, json.JSONDecodeError, KeyError) as e:
+                # If state cannot be loaded, continue without snapshot
+                logger.warning("Could not load state snapshot for dead letter: %s", e)
+            
+            dead_letter_id = self._record_dead_letter_locked(
+                project_id=project_id,
+                state=state,
+                stage=stage,
+                agent=agent,
+                error=error,
+                context=context,
+                request=request,
+                trace=trace,
+                attempt_number=attempt_number,
+                now=_utcnow_iso()
+            )
+            
+            # Update state metrics (reuse previously loaded state)
+            if state is not None:
                 try:
-                    state = self.get_state(project_id)
-                    state_snapshot = {
-                        "current_stage": state.get("current_stage"),
-                        "status": state.get("status"),
-                        "metrics": state.get("metrics", {})
-                    }
-                    labels = state.get("labels", {})
+                    # Write state directly (we already have the lock)
+                    self._save_state(project_id, state_path, state)
                 except (FileNotFoundError, json.JSONDecodeError, KeyError) as e:
-                    # If state cannot be loaded, continue without snapshot
-                    print(f"Warning: Could not load state snapshot for dead letter: {e}", file=sys.stderr)
-                
-                entry = {
-                    "id": dead_letter_id,
-                    "timestamp": now,
-                    "stage": stage,
-                    "agent": agent,
-                    "attempt_number": attempt_number,
-                    "error": error,
-                    "context": context or {},
-                    "request": request or {},
-                    "trace": trace or [],
-                    "labels": labels,
-                    "recovery_attempted": False,
-                    "replay_count": 0
+                    # If state update fails, log but continue
+                    logger.warning("Could not update state metrics: %s", e)
+        
+        # Log transition (outside the locks)
+        self._log_error_recorded(project_id, stage, agent, error, dead_letter_id)
+        
+        return dead_letter_id
+    
+    def _record_dead_letter_locked(
+        self,
+        project_id: str,
+        state: Optional[Dict[str, Any]],
+        stage: str,
+        agent: str,
+        error: Dict[str, Any],
+        context: Optional[Dict[str, Any]],
+        request: Optional[Dict[str, Any]],
+        trace: Optional[List[Dict[str, Any]]],
+        attempt_number: int,
+        now: str
+    ) -> str:
+        """
+        Write a dead letter entry; the caller must hold the state lock.
+        
+        The dead letters lock is taken here, after the state lock, keeping
+        the lock order consistent. If ``state`` is given it provides the
+        snapshot and labels, and its ``metrics.dead_letters`` count is
+        updated in place for the caller to write.
+        
+        Returns:
+            Dead letter ID
+        """
+        dead_letters_path = self._get_dead_letters_path(project_id)
+        
+        with self._lock(dead_letters_path):
+            # Only the small stats document is read and rewritten; the entry
+            # itself is appended to the JSONL file
+            stats_doc = self._read_dead_letter_stats(project_id)
+            
+            # Create dead letter entry
+            dead_letter_id = _new_uuid4()
+            
+            state_snapshot = {}
+            labels = {}
+            if state is not None:
+                state_snapshot = {
+                    "current_stage": state.get("current_stage"),
+                    "status": state.get("status"),
+                    "metrics": dict(state.get("metrics", {}))
                 }
-                
-                # Update context with state snapshot
-                entry["context"]["state_snapshot"] = state_snapshot
-                
-                # Add entry
-                dead_letters["entries"].append(entry)
-                
-                # Update statistics
-                stats = dead_letters["statistics"]
-                stats["total_entries"] += 1
-                stats["by_stage"][stage] = stats["by_stage"].get(stage, 0) + 1
-                stats["by_agent"][agent] = stats["by_agent"].get(agent, 0) + 1
-                stats["unrecovered"] += 1
-                
-                # Write dead letters (within the lock, but not using _atomic_write_json
-                # since we already have the lock)
-                dead_letters_path.parent.mkdir(parents=True, exist_ok=True)
-                tmp_dl_path = dead_letters_path.with_suffix('.tmp')
+                labels = state.get("labels", {})
+            
+            entry = {
+                "id": dead_letter_id,
+                "timestamp": now,
+                "stage": stage,
+                "agent": agent,
+                "attempt_number": attempt_number,
+                "error": error,
+                "context": context or {},
+                "request": request or {},
+                "trace": trace or [],
+                "labels": labels,
+                "recovery_attempted": False,
+                "replay_count": 0
+            }
+            
+            # Update context with state snapshot
+            entry["context"]["state_snapshot"] = state_snapshot
+            
+            # Append entry (the dead letters lock is reentrant)
+            self._append_jsonl_lines(dead_letters_path, [_dump_line(entry)])
+            
+            # Update statistics
+            stats = stats_doc["statistics"]
+            stats["total_entries"] += 1
+            stats["by_stage"][stage] = stats["by_stage"].get(stage, 0) + 1
+            stats["by_agent"][agent] = stats["by_agent"].get(agent, 0) + 1
+            stats["unrecovered"] += 1
+            
+            # Stats are guarded by the dead letters lock, which we already hold
+            self._write_json_locked(self._get_dead_letter_stats_path(project_id), stats_doc)
+        
+        if state is not None:
+            state.setdefault("metrics", {})["dead_letters"] = stats["total_entries"]
+        
+        return dead_letter_id
+    
+    def _reset_dead_letters(self, project_id: str) -> None:
+        """Create empty dead letter files, discarding any existing entries."""
+        dead_letters_path = self._get_dead_letters_path(project_id)
+        self._ensure_dir(dead_letters_path)
+        
+        with self._lock(dead_letters_path):
+            open(dead_letters_path, 'wb').close()
+            self._jsonl_cache.pop(str(dead_letters_path), None)
+            with self._dead_letter_queries_lock:
+                self._dead_letter_queries.pop(project_id, None)
+            self._get_legacy_dead_letters_path(project_id).unlink(missing_ok=True)
+            self._write_json_locked(
+                self._get_dead_letter_stats_path(project_id),
+                {
+                    "project_id": project_id,
+                    "version": "2.0.0",
+                    "statistics": _empty_dead_letter_statistics()
+                }
+            )
+    
+    def _read_dead_letter_stats(self, project_id: str) -> Dict[str, Any]:
+        """
+        Read the dead letter stats document.
+        
+        Projects created before the JSONL layout have no stats file; their
+        counts are taken from the legacy dead_letters.json.
+        """
+        try:
+            return _load_bytes(self._read_file_bytes(self._get_dead_letter_stats_path(project_id)))
+        except FileNotFoundError:
+            pass
+        
+        try:
+            legacy = _load_bytes(self._read_file_bytes(self._get_legacy_dead_letters_path(project_id)))
+            statistics = legacy.get("statistics") or _empty_dead_letter_statistics()
+        except FileNotFoundError:
+            statistics = _empty_dead_letter_statistics()
+        
+        return {"project_id": project_id, "version": "2.0.0", "statistics": statistics}
+    
+    def load_dead_letters(self, project_id: str) -> Dict[str, Any]:
+        """
+        Load all dead letters for a project.
+        
+        Streams entries from dead_letters.jsonl (converting a legacy
+        dead_letters.json on first access) and merges in the stats file,
+        returning the ``{project_id, version, entries, statistics}``
+        document described by dead_letters_schema.json.
+        
+        Args:
+            project_id: Project identifier
+            
+        Returns:
+            Dead letter document
+        """
+        entries = _copy_json(self._load_dead_letter_entries(project_id))
+        stats_doc = self._read_dead_letter_stats(project_id)
+        
+        return {
+            "project_id": project_id,
+            "version": stats_doc.get("version", "2.0.0"),
+            "entries": entries,
+            "statistics": stats_doc["statistics"]
+        }
+    
+    def _load_dead_letter_entries(self, project_id: str) -> List[Dict[str, Any]]:
+        """Read dead letter entries, migrating a legacy dead_letters.json first."""
+        self._migrate_legacy_dead_letters(project_id)
+        try:
+            return self._read_jsonl(self._get_dead_letters_path(project_id))
+        except FileNotFoundError:
+            return []
+    
+    def _migrate_legacy_dead_letters(self, project_id: str) -> None:
+        """
+        Convert a pre-JSONL dead_letters.json to dead_letters.jsonl.
+        
+        Legacy entries are written ahead of any already appended to the
+        JSONL file, the legacy statistics seed the stats file unless it
+        already exists, and the legacy file is removed. Checked once per
+        project per manager.
+        """
+        if project_id in self._migrated_dead_letters:
+            return
+        
+        legacy_path = self._get_legacy_dead_letters_path(project_id)
+        if legacy_path.exists():
+            dead_letters_path = self._get_dead_letters_path(project_id)
+            with self._lock(dead_letters_path):
                 try:
-                    with open(tmp_dl_path, 'w') as f:
-                        json.dump(dead_letters, f, indent=2)
-                    tmp_dl_path.replace(dead_letters_path)
-                except Exception as e:
-                    if tmp_dl_path.exists():
-                        tmp_dl_path.unlink()
-                    raise
+                    legacy = _load_bytes(self._read_file_bytes(legacy_path))
+                except FileNotFoundError:
+                    # Migrated by another process meanwhile
+                    legacy = None
                 
-                # Update state metrics (reuse previously loaded state)
-                if state is not None:
+                if legacy is not None:
                     try:
-                        state["metrics"]["dead_letters"] = stats["total_entries"]
-                        # Write state directly (we already have the lock)
-                        tmp_state_path = state_path.with_suffix('.tmp')
-                        try:
-                            with open(tmp_state_path, 'w') as f:
-                                json.dump(state, f, indent=2)
-                            tmp_state_path.replace(state_path)
-                        except Exception as e:
-                            if tmp_state_path.exists():
-                                tmp_state_path.unlink()
-                            raise
-                    except (FileNotFoundError, json.JSONDecodeError, KeyError) as e:
-                        # If state update fails, log but continue
-                        print(f"Warning: Could not update state metrics: {e}", file=sys.stderr)
+                        entries = self._read_jsonl(dead_letters_path)
+                    except FileNotFoundError:
+                        entries = []
+                    # A crash after the rewrite but before the unlink leaves
+                    # the legacy entries already in the JSONL file
+                    present = {entry.get("id") for entry in entries}
+                    entries[:0] = [
+                        entry for entry in legacy.get("entries", [])
+                        if entry.get("id") is None or entry.get("id") not in present
+                    ]
+                    
+                    # Stats must not depend on the legacy file once it is removed
+                    self._write_json_locked(
+                        self._get_dead_letter_stats_path(project_id),
+                        self._read_dead_letter_stats(project_id)
+                    )
+                    self._write_bytes_locked(
+                        dead_letters_path, b''.join(map(_dump_line, entries)), durable=True
+                    )
+                    legacy_path.unlink()
+        
+        self._migrated_dead_letters.add(project_id)
+    
+    def compact_dead_letters(self, project_id: str, older_than_days: float) -> int:
+        """
+        Remove successfully recovered dead letters older than a cutoff.
         
-        # Log transition (outside the locks)
+        Rewrites dead_letters.jsonl, keeping unrecovered entries and
+        everything newer than the cutoff.
+        This is the only full rewrite of the file. Statistics are left as
+        they are, so they keep counting the removed entries.
+        
+        Args:
+            project_id: Project identifier
+            older_than_days: Age in days past which recovered entries are removed
+            
+        Returns:
+            Number of entries removed
+        """
+        cutoff = datetime.now(timezone.utc) - timedelta(days=older_than_days)
+        dead_letters_path = self._get_dead_letters_path(project_id)
+        
+        with self._lock(dead_letters_path):
+            entries = self._load_dead_letter_entries(project_id)
+            kept = [
+                e for e in entries
+                if _is_unrecovered(e) or not _recorded_before(e, cutoff)
+            ]
+            if len(kept) == len(entries):
+                return 0
+            
+            self._write_bytes_locked(
+                dead_letters_path, b''.join(map(_dump_line, kept)), durable=True
+            )
+        
+        return len(entries) - len(kept)
+    
+    def _dead_letter_index(self, project_id: str, entries: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Get the positions of dead letters by stage, by agent and unrecovered.
+        
+        The index is built on first use and extended as entries are appended.
+        Entries re-read from disk are new objects, so a different first entry
+        means the file was rewritten and the index is rebuilt. Posting lists
+        only ever grow, so readers may use them while another thread extends
+        them.
+        
+        Args:
+            project_id: Project identifier
+            entries: Current dead letter entries
+            
+        Returns:
+            Index with ``by_stage`` and ``by_agent`` (value -> positions) and
+            ``unrecovered`` (positions), all in ascending order
+        """
+        with self._dead_letter_indexes_lock:
+            index = self._dead_letter_indexes.get(project_id)
+            if index is None or not entries or index["first"] is not entries[0]:
+                index = {
+                    "first": entries[0] if entries else None,
+                    "count": 0,
+                    "by_stage": {},
+                    "by_agent": {},
+                    "unrecovered": []
+                }
+                self._dead_letter_indexes[project_id] = index
+            
+            by_stage = index["by_stage"]
+            by_agent = index["by_agent"]
+            unrecovered = index["unrecovered"]
+            for position in range(index["count"], len(entries)):
+                entry = entries[position]
+                by_stage.setdefault(entry.get("stage"), []).append(position)
+                by_agent.setdefault(entry.get("agent"), []).append(position)
+                if _is_unrecovered(entry):
+                    unrecovered.append(position)
+            index["count"] = max(index["count"], len(entries))
+        
+        return index
+    
+    def _transition_index(self, project_id: str, entries: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Get the positions of transitions by event type and by stage.
+        
+        Maintained like _dead_letter_index: built on first use, extended as
+        entries are appended and rebuilt when the file was rewritten.
+        
+        Args:
+            project_id: Project identifier
+            entries: Current transition entries
+            
+        Returns:
+            Index with ``by_event_type`` and ``by_stage`` (value -> positions),
+            in ascending order
+        """
+        with self._transition_indexes_lock:
+            index = self._transition_indexes.get(project_id)
+            if index is None or not entries or index["first"] is not entries[0]:
+                index = {
+                    "first": entries[0] if entries else None,
+                    "count": 0,
+                    "by_event_type": {},
+                    "by_stage": {}
+                }
+                self._transition_indexes[project_id] = index
+            
+            by_event_type = index["by_event_type"]
+            by_stage = index["by_stage"]
+            for position in range(index["count"], len(entries)):
+                entry = entries[position]
+                by_event_type.setdefault(entry["event_type"], []).append(position)
+                by_stage.setdefault(entry.get("stage"), []).append(position)
+            index["count"] = max(index["count"], len(entries))
+        
+        return index
+    
+    def _log_error_recorded(
+        self,
+        project_id: str,
+        stage: str,
+        agent: str,
+        error: Dict[str, Any],
+        dead_letter_id: str
+    ) -> None:
+        """Log the error_recorded transition for a new dead letter."""
         self.log_transition(
             project_id=project_id,
             event_type="error_recorded",
@@ -847,8 +1901,6 @@ class StateManager:
                 "dead_letter_id": dead_letter_id
             }
         )
-        
-        return dead_letter_id
     
     def log_transition(
         self,
@@ -870,6 +1922,9 @@ class StateManager:
         """
         Log a state transition to the audit log.
         
+        Entries are buffered and appended in batches shortly afterwards
+        (see flush()).
+        
         Args:
             project_id: Project identifier
             event_type: Type of transition event
@@ -889,8 +1944,8 @@ class StateManager:
         Returns:
             Transition ID
         """
-        transition_id = str(uuid.uuid4())
-        now = datetime.utcnow().isoformat() + 'Z'
+        transition_id = _new_uuid4()
+        now = _utcnow_iso()
         
         entry = {
             "id": transition_id,
@@ -925,8 +1980,8 @@ class StateManager:
         if checkpoint_id:
             entry["checkpoint_id"] = checkpoint_id
         
-        # Append to transitions.jsonl
-        self._append_jsonl(self._get_transitions_path(project_id), entry)
+        # Buffer for a batched append to transitions.jsonl
+        self._queue_transition(self._get_transitions_path(project_id), _dump_line(entry))
         
         return transition_id
     
@@ -950,35 +2005,76 @@ class StateManager:
             List of transition entries
         """
         transitions_path = self._get_transitions_path(project_id)
+        
+        # Read our own buffered writes
+        self.flush()
         if not transitions_path.exists():
             return []
         
         transitions = []
-        with open(transitions_path, 'r') as f:
-            for line in f:
-                if line.strip():
-                    entry = json.loads(line)
-                    
-                    # Apply filters
-                    if event_type and entry.get("event_type") != event_type:
-                        continue
-                    if stage and entry.get("stage") != stage:
-                        continue
-                    
-                    transitions.append(entry)
         
-        # Apply limit (most recent)
+        # Most recent N: scan backwards from EOF and stop once N matched
         if limit and limit > 0:
-            transitions = transitions[-limit:]
+            probes = [probe for probe in map(_json_string_probe, (event_type, stage)) if probe]
+            for line in _iter_lines_reversed(transitions_path):
+                # Lines lacking a filter value cannot match; skip parsing them
+                if probes and not all(probe in line for probe in probes):
+                    continue
+                entry = _load_bytes(line)
+                if event_type and entry.get("event_type") != event_type:
+                    continue
+                if stage and entry.get("stage") != stage:
+                    continue
+                transitions.append(entry)
+                if len(transitions) == limit:
+                    break
+            transitions.reverse()
+            return transitions
         
-        return transitions
+        try:
+            entries = self._read_jsonl(transitions_path)
+        except FileNotFoundError:
+            return []
+        
+        # Cached entries are shared; callers get their own copies
+        return _copy_json(self._filter_transitions(project_id, entries, event_type, stage))
+    
+    def _filter_transitions(
+        self,
+        project_id: str,
+        entries: List[Dict[str, Any]],
+        event_type: Optional[str],
+        stage: Optional[str]
+    ) -> List[Dict[str, Any]]:
+        """Select cached transition entries by event type and stage."""
+        if not event_type and not stage:
+            return entries
+        
+        # Visit only the positions matching the filters; event_type is
+        # required by the schema, stage is optional
+        index = self._transition_index(project_id, entries)
+        count = len(entries)
+        if event_type and stage:
+            positions = index["by_event_type"].get(event_type, ())
+            stage_positions = index["by_stage"].get(stage, ())
+            if len(stage_positions) < len(positions):
+                return [entries[i] for i in stage_positions
+                        if i < count and entries[i]["event_type"] == event_type]
+            return [entries[i] for i in positions
+                    if i < count and entries[i].get("stage") == stage]
+        if event_type:
+            positions = index["by_event_type"].get(event_type, ())
+        else:
+            positions = index["by_stage"].get(stage, ())
+        return [entries[i] for i in positions if i < count]
     
     def get_dead_letters(
         self,
         project_id: str,
         stage: str = None,
         agent: str = None,
-        unrecovered_only: bool = False
+        unrecovered_only: bool = False,
+        limit: int = None
     ) -> List[Dict[str, Any]]:
         """
         Get dead letter entries.
@@ -988,29 +2084,175 @@ class StateManager:
             stage: Filter by stage
             agent: Filter by agent
             unrecovered_only: Only return unrecovered failures
+            limit: Maximum number of entries to return (most recent)
             
         Returns:
             List of dead letter entries
         """
-        dead_letters_path = self._get_dead_letters_path(project_id)
-        if not dead_letters_path.exists():
-            return []
+        most_recent = bool(limit and limit > 0)
+        query = (stage, agent, bool(unrecovered_only), limit if most_recent else None)
+        
+        # Identical queries against unchanged files reuse the previous result
+        version = (
+            _stat_key(self._get_dead_letters_path(project_id)),
+            _stat_key(self._get_legacy_dead_letters_path(project_id))
+        )
+        with self._dead_letter_queries_lock:
+            queries = self._dead_letter_queries.get(project_id)
+            cached = queries.get(query) if queries else None
+            if cached is not None and cached[0] == version:
+                queries.move_to_end(query)
+                return _copy_json(cached[1])
+        
+        result = self._query_dead_letters(project_id, stage, agent, unrecovered_only, limit)
+        if not self.cache_enabled:
+            return _copy_json(result)
+        
+        with self._dead_letter_queries_lock:
+            queries = self._dead_letter_queries.setdefault(project_id, OrderedDict())
+            queries[query] = (version, result)
+            queries.move_to_end(query)
+            if len(queries) > MAX_CACHED_DEAD_LETTER_QUERIES:
+                queries.popitem(last=False)
+        
+        # Memoized results share entries with the JSONL cache; return copies
+        return _copy_json(result)
+    
+    def _query_dead_letters(
+        self,
+        project_id: str,
+        stage: Optional[str],
+        agent: Optional[str],
+        unrecovered_only: bool,
+        limit: Optional[int]
+    ) -> List[Dict[str, Any]]:
+        """Filter the current dead letters; see get_dead_letters."""
+        most_recent = bool(limit and limit > 0)
         
-        with open(dead_letters_path, 'r') as f:
-            dead_letters = json.load(f)
+        if not (stage or agent or unrecovered_only):
+            entries = self._load_dead_letter_entries(project_id)
+            return entries[-limit:] if most_recent else entries
         
-        entries = dead_letters.get("entries", [])
+        matches = self._iter_dead_letters(
+            project_id, stage, agent, unrecovered_only, newest_first=most_recent
+        )
         
-        # Apply filters
+        # Most recent N: walk backwards and stop once N matched
+        if most_recent:
+            recent = list(itertools.islice(matches, limit))
+            recent.reverse()
+            return recent
+        return list(matches)
+    
+    def iter_dead_letters(
+        self,
+        project_id: str,
+        stage: str = None,
+        agent: str = None,
+        unrecovered_only: bool = False,
+        newest_first: bool = False
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over dead letter entries, filtering lazily.
+        
+        The entries are loaded when this is called; filtering happens as the
+        iterator is consumed, so ``next()`` or ``any()`` stop early.
+        
+        Args:
+            project_id: Project identifier
+            stage: Filter by stage
+            agent: Filter by agent
+            unrecovered_only: Only yield unrecovered failures
+            newest_first: Yield the most recent entries first
+            
+        Returns:
+            Iterator of dead letter entries, each copied as it is yielded
+        """
+        return map(_copy_json, self._iter_dead_letters(
+            project_id, stage, agent, unrecovered_only, newest_first
+        ))
+    
+    def _iter_dead_letters(
+        self,
+        project_id: str,
+        stage: Optional[str],
+        agent: Optional[str],
+        unrecovered_only: bool,
+        newest_first: bool
+    ) -> Iterator[Dict[str, Any]]:
+        """Iterate over the shared cached entries; see iter_dead_letters."""
+        entries = self._load_dead_letter_entries(project_id)
+        
+        if not (stage or agent or unrecovered_only):
+            return reversed(entries) if newest_first else iter(entries)
+        
+        # Parsed stage/agent values are interned, so comparisons hit identity
+        if type(stage) is str:
+            stage = sys.intern(stage)
+        if type(agent) is str:
+            agent = sys.intern(agent)
+        
+        # Visit only the shortest matching posting list, then apply all filters
+        index = self._dead_letter_index(project_id, entries)
+        postings = []
         if stage:
-            entries = [e for e in entries if e.get("stage") == stage]
+            postings.append(index["by_stage"].get(stage, ()))
         if agent:
-            entries = [e for e in entries if e.get("agent") == agent]
+            postings.append(index["by_agent"].get(agent, ()))
         if unrecovered_only:
-            # Filter to entries that haven't been successfully recovered
-            entries = [
-                e for e in entries 
-                if not e.get("recovery_attempted") or e.get("recovery_result") != "success"
-            ]
-        
-        return entries
+            postings.append(index["unrecovered"])
+        positions = min(postings, key=len)
+        
+        # Another thread may have indexed entries beyond our copy of the list
+        count = len(entries)
+        candidates = (
+            entries[i] for i in (reversed(positions) if newest_first else positions)
+            if i < count
+        )
+        if len(postings) == 1:
+            # A single filter's posting list is exact
+            return candidates
+        return (
+            e for e in candidates
+            if (not stage or e.get("stage") == stage)
+            and (not agent or e.get("agent") == agent)
+            and (not unrecovered_only or _is_unrecovered(e))
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Print a project's state or dead letters as indented JSON."""
+    parser = argparse.ArgumentParser(
+        description="SOMAS State Manager - Inspect project state files",
+    )
+    parser.add_argument(
+        "--projects-dir",
+        default=".somas/projects",
+        help="Directory containing project state (default: .somas/projects)",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    cat_parser = subparsers.add_parser("cat", help="Pretty-print a project's state.json")
+    cat_parser.add_argument("project_id", help='Project identifier (e.g., "project-123")')
+    cat_parser.add_argument(
+        "--dead-letters",
+        action="store_true",
+        help="Print the dead letters document instead of the state",
+    )
+    args = parser.parse_args(argv)
+    
+    manager = StateManager(projects_dir=args.projects_dir)
+    try:
+        if args.dead_letters:
+            data = manager.load_dead_letters(args.project_id)
+        else:
+            data = manager.get_state(args.project_id)
+    except (ValueError, FileNotFoundError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    
+    print(json.dumps(data, indent=2, sort_keys=True, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
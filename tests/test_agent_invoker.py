@@ -107,6 +107,8 @@ class TestAgentInvoker:
         assert not invoker._validate_project_id("not-a-project-id")
         assert not invoker._validate_project_id("")
         assert not invoker._validate_project_id("project-")
+        assert not invoker._validate_project_id("project-123\n")
+        assert not invoker._validate_project_id(None)
     
     def test_load_config(self, temp_somas_dir):
         """Test configuration loading"""
@@ -118,6 +120,24 @@ class TestAgentInvoker:
         assert 'agent_configs' in config['agents']
         assert 'openai' in config['agents']['providers']
     
+    def test_load_config_parsed_once(self, temp_somas_dir):
+        """Test the config is parsed once per version and copied per invoker"""
+        import yaml
+        
+        with patch("somas.core.agent_invoker.yaml.load", wraps=yaml.load) as load:
+            first = AgentInvoker()
+            second = AgentInvoker()
+            assert load.call_count == 1
+            
+            first.config["agents"]["agent_configs"]["planner"]["provider"] = "changed"
+            assert second._get_agent_config("planner")["provider"] == "openai"
+            
+            # Edits to the file are picked up
+            config_path = Path(temp_somas_dir) / ".somas" / "config.yml"
+            config_path.write_text(config_path.read_text() + "    tester:\n      provider: \"openai\"\n")
+            assert AgentInvoker()._get_agent_config("tester") == {"provider": "openai"}
+            assert load.call_count == 2
+    
     def test_load_agent_prompt(self, temp_somas_dir):
         """Test agent prompt loading"""
         invoker = AgentInvoker()
@@ -128,6 +148,15 @@ class TestAgentInvoker:
         # Frontmatter should be stripped
         assert "---" not in prompt or prompt.count("---") < 2
     
+    def test_load_agent_prompt_sees_edits(self, temp_somas_dir):
+        """Test cached agent prompts are reloaded when the file changes"""
+        invoker = AgentInvoker()
+        agent_file = Path(temp_somas_dir) / ".github" / "agents" / "somas-planner.md"
+        assert invoker._load_agent_prompt("planner").startswith("# Test Planner Agent")
+        
+        agent_file.write_text("---\nname: somas-planner\n---\n\n# Revised Planner Agent\n")
+        assert invoker._load_agent_prompt("planner") == "# Revised Planner Agent"
+    
     def test_load_agent_prompt_not_found(self, temp_somas_dir):
         """Test agent prompt loading with non-existent agent"""
         invoker = AgentInvoker()
@@ -5,6 +5,7 @@ This test suite verifies the error handling improvements made to address
 critical gaps identified in code review.
 """
 
+import json
 import os
 import shutil
 import tempfile
@@ -81,6 +82,7 @@ agents:
             "project-123/../../secrets",
             "",
             "null",
+            "project-123\n",
         ]
 
         for project_id in invalid_ids:
@@ -106,6 +108,14 @@ agents:
             "Should return error code for invalid project_id",
         )
 
+    def test_config_loaded_lazily(self):
+        """Test validation paths do not parse the config."""
+        self.config_path.write_text("invalid: yaml: content: [unclosed")
+        runner = SOMASRunner()
+
+        self.assertTrue(runner._validate_project_id("project-1"))
+        self.assertNotIn("config", vars(runner))
+
     def test_load_config_file_not_found(self):
         """Test _load_config raises RuntimeError for missing file."""
         # Create runner, then change config path to non-existent file
@@ -122,11 +132,105 @@ agents:
         # Write invalid YAML to config file
         self.config_path.write_text("invalid: yaml: content: [unclosed")
 
+        runner = SOMASRunner()  # Config is loaded lazily
         with self.assertRaises(RuntimeError) as context:
-            SOMASRunner()  # Will raise during __init__
+            runner.config
 
         self.assertIn("Invalid YAML", str(context.exception))
 
+    def test_load_config_uses_json_cache(self):
+        """Test parsed config is cached as JSON and invalidated on change."""
+        runner = SOMASRunner()
+        config = runner.config
+        cache_path = self.config_dir / "config.yml.cache.json"
+        self.assertTrue(cache_path.exists())
+        self.assertEqual(runner._load_config(), config)
+
+        # The shared config is frozen rather than copied per caller
+        with self.assertRaises(TypeError):
+            config["version"] = "changed"
+
+        # Changing the YAML (size differs) must bypass the stale cache
+        self.config_path.write_text('version: "2.0.0"\n')
+        self.assertEqual(runner._load_config(), {"version": "2.0.0"})
+
+    def test_get_agent_config(self):
+        """Test configured agents are returned and unknown ones defaulted."""
+        runner = SOMASRunner()
+
+        self.assertEqual(
+            runner._get_agent_config("test_agent"), {"provider": "test_provider"}
+        )
+        self.assertEqual(
+            runner._get_agent_config("unknown_agent"),
+            {"provider": "gpt_5_2", "description": "Agent: unknown_agent"},
+        )
+
+    def test_validate_path(self):
+        """Test output/context paths must stay inside the repository."""
+        runner = SOMASRunner()
+        outside_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, outside_dir, ignore_errors=True)
+        os.symlink(outside_dir, self.repo_root / "escape")
+
+        self.assertTrue(runner._validate_path("artifacts/new/report.md"))
+        self.assertTrue(runner._validate_path(str(self.repo_root)))
+        self.assertFalse(runner._validate_path("../outside.md"))
+        self.assertFalse(runner._validate_path(self.temp_dir + "-sibling/x.md"))
+        self.assertFalse(runner._validate_path("escape/secret.md"))
+
+    def test_load_context_files(self):
+        """Test context files are read and invalid paths skipped."""
+        runner = SOMASRunner()
+        (self.repo_root / "SPEC.md").write_bytes(b"line one\r\nline two\n")
+
+        context = runner._load_context_files(
+            ["SPEC.md", "../outside.md", "missing.md"]
+        )
+
+        self.assertEqual(context, {"SPEC.md": "line one\nline two\n"})
+
+        # A modified file must not be served from the in-process cache
+        (self.repo_root / "SPEC.md").write_text("updated spec\n")
+        context = runner._load_context_files(["SPEC.md"])
+        self.assertEqual(context, {"SPEC.md": "updated spec\n"})
+
+    def test_load_context_files_drops_unreadable(self):
+        """Test a context file that cannot be read is dropped on first access."""
+        runner = SOMASRunner()
+        for name in ("SPEC.md", "ARCHITECTURE.md", "broken.md"):
+            (self.repo_root / name).write_text(f"{name}\n")
+
+        context = runner._load_context_files(["SPEC.md", "ARCHITECTURE.md", "broken.md"])
+        self.assertEqual(list(context), ["SPEC.md", "ARCHITECTURE.md", "broken.md"])
+
+        (self.repo_root / "broken.md").write_bytes(b"\xff\xfe invalid utf-8")
+        with self.assertRaises(KeyError):
+            context["broken.md"]
+        self.assertEqual(
+            dict(context), {"SPEC.md": "SPEC.md\n", "ARCHITECTURE.md": "ARCHITECTURE.md\n"}
+        )
+
+    def test_run_task_writes_output(self):
+        """Test run_task writes the placeholder report with its metadata."""
+        runner = SOMASRunner()
+        (self.repo_root / "SPEC.md").write_text("spec\n")
+
+        exit_code = runner.run_task(
+            agent="test_agent",
+            task_name="Build",
+            task_desc="Build the thing",
+            context_files=["SPEC.md"],
+            output_path="artifacts/result.md",
+        )
+
+        self.assertEqual(exit_code, 0)
+        output = (self.repo_root / "artifacts" / "result.md").read_text()
+        self.assertTrue(output.startswith("# Task: Build\n\n"))
+        metadata = json.loads(output.split("```json\n", 1)[1].rsplit("\n```", 1)[0])
+        self.assertEqual(metadata["provider"], "test_provider")
+        self.assertEqual(metadata["context_files"], ["SPEC.md"])
+
     def test_ensure_valid_project_id_auto_generate(self):
         """Test auto-generation of project ID from issue number."""
         runner = SOMASRunner()
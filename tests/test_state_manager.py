@@ -6,18 +6,24 @@ Tests the state persistence, dead letter vault, and transition audit functionali
 """
 
 import unittest
+import unittest.mock
+import os
+import io
+import contextlib
 import json
 import tempfile
 import shutil
 import threading
+import time
+import uuid
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timedelta
 
 # Add somas to path
 import sys
 sys.path.insert(0, str(Path(__file__).parent.parent / "somas"))
 
-from core.state_manager import StateManager
+from core.state_manager import StateManager, _iso_from_ns, _load_max_checkpoints, main
 
 
 class TestStateManager(unittest.TestCase):
@@ -34,7 +40,8 @@ class TestStateManager(unittest.TestCase):
         
     def tearDown(self):
         """Clean up test fixtures."""
-        # Remove temporary directory
+        # Write out buffered transitions, then remove temporary directory
+        self.state_manager.flush()
         shutil.rmtree(self.test_dir)
     
     def test_project_initialization(self):
@@ -55,7 +62,8 @@ class TestStateManager(unittest.TestCase):
         # Check files created
         project_dir = Path(self.test_dir) / self.project_id
         self.assertTrue((project_dir / "state.json").exists())
-        self.assertTrue((project_dir / "dead_letters.json").exists())
+        self.assertTrue((project_dir / "dead_letters.jsonl").exists())
+        self.assertTrue((project_dir / "dead_letters.stats.json").exists())
         self.assertTrue((project_dir / "transitions.jsonl").exists())
         
         # Check state.json content
@@ -65,11 +73,12 @@ class TestStateManager(unittest.TestCase):
         self.assertEqual(len(state_file["stages"]), 11)  # 11-stage Aether Lifecycle pipeline
         self.assertEqual(state_file["metrics"]["dead_letters"], 0)
         
-        # Check dead_letters.json content
-        with open(project_dir / "dead_letters.json", 'r') as f:
-            dead_letters = json.load(f)
-        self.assertEqual(dead_letters["project_id"], self.project_id)
-        self.assertEqual(len(dead_letters["entries"]), 0)
+        # Check dead letter files content
+        self.assertEqual((project_dir / "dead_letters.jsonl").stat().st_size, 0)
+        with open(project_dir / "dead_letters.stats.json", 'r') as f:
+            stats = json.load(f)
+        self.assertEqual(stats["project_id"], self.project_id)
+        self.assertEqual(stats["statistics"]["total_entries"], 0)
         
         # Check transitions.jsonl has initialization entry
         with open(project_dir / "transitions.jsonl", 'r') as f:
@@ -78,6 +87,369 @@ class TestStateManager(unittest.TestCase):
         transition = json.loads(lines[0])
         self.assertEqual(transition["event_type"], "project_initialized")
     
+    def test_transitions_flushed_in_order(self):
+        """Test buffered transitions are written in logging order on flush."""
+        self.state_manager.initialize_project(
+            project_id=self.project_id,
+            issue_number=self.issue_number,
+            title=self.title
+        )
+        
+        for i in range(20):
+            self.state_manager.log_transition(
+                project_id=self.project_id,
+                event_type="state_updated",
+                metadata={"seq": i}
+            )
+        self.state_manager.flush()
+        
+        transitions_path = Path(self.test_dir) / self.project_id / "transitions.jsonl"
+        with open(transitions_path, 'r') as f:
+            entries = [json.loads(line) for line in f]
+        self.assertEqual(len(entries), 21)
+        self.assertEqual([e["metadata"]["seq"] for e in entries[1:]], list(range(20)))
+    
+    def test_cat_pretty_prints_compact_state(self):
+        """Test state.json is stored compact and the cat command indents it."""
+        self.state_manager.initialize_project(
+            project_id=self.project_id,
+            issue_number=self.issue_number,
+            title=self.title
+        )
+        state_path = Path(self.test_dir) / self.project_id / "state.json"
+        self.assertNotIn(b"\n", state_path.read_bytes())
+        
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            exit_code = main(["--projects-dir", self.test_dir, "cat", self.project_id])
+        self.assertEqual(exit_code, 0)
+        self.assertIn('\n  "project_id": ', out.getvalue())
+        self.assertEqual(json.loads(out.getvalue())["issue_number"], self.issue_number)
+        
+        with contextlib.redirect_stderr(io.StringIO()):
+            self.assertEqual(main(["--projects-dir", self.test_dir, "cat", "project-0"]), 1)
+    
+    def test_transitions_written_in_background(self):
+        """Test the writer thread appends buffered transitions without a flush."""
+        self.state_manager.initialize_project(
+            project_id=self.project_id,
+            issue_number=self.issue_number,
+            title=self.title
+        )
+        self.state_manager.log_transition(project_id=self.project_id, event_type="state_updated")
+        
+        transitions_path = Path(self.test_dir) / self.project_id / "transitions.jsonl"
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            with open(transitions_path, 'rb') as f:
+                if len(f.readlines()) == 2:
+                    break
+            time.sleep(0.01)
+        with open(transitions_path, 'rb') as f:
+            self.assertEqual(len(f.readlines()), 2)
+    
+    def test_failed_flush_keeps_transitions(self):
+        """Test transitions survive a failed append and are written on retry."""
+        self.state_manager.initialize_project(
+            project_id=self.project_id,
+            issue_number=self.issue_number,
+            title=self.title
+        )
+        manager = self.state_manager
+        manager.flush()
+        
+        with unittest.mock.patch.object(manager, "_append_jsonl_lines", side_effect=OSError(28, "No space left on device")):
+            manager.log_transition(project_id=self.project_id, event_type="before")
+            with self.assertRaises(OSError):
+                manager.flush()
+        manager.log_transition(project_id=self.project_id, event_type="after")
+        
+        events = [t["event_type"] for t in manager.get_transitions(self.project_id)]
+        self.assertEqual(events, ["project_initialized", "before", "after"])
+    
+    @unittest.skipUnless(hasattr(os, "fork"), "requires os.fork")
+    def test_fork_child_does_not_rewrite_parent_transitions(self):
+        """Test a forked child starts without the parent's buffered transitions."""
+        self.state_manager.initialize_project(
+            project_id=self.project_id,
+            issue_number=self.issue_number,
+            title=self.title
+        )
+        manager = self.state_manager
+        
+        # Keep the background writer from flushing before the fork
+        with unittest.mock.patch("core.state_manager.TRANSITION_FLUSH_INTERVAL", 5):
+            manager.log_transition(project_id=self.project_id, event_type="parent_event")
+            pid = os.fork()
+            if pid == 0:
+                try:
+                    manager.log_transition(project_id=self.project_id, event_type="child_event")
+                    manager.flush()
+                finally:
+                    os._exit(0)
+            os.waitpid(pid, 0)
+            manager.flush()
+        
+        events = [t["event_type"] for t in manager.get_transitions(self.project_id)]
+        self.assertEqual(events, ["project_initialized", "child_event", "parent_event"])
+    
+    def test_removed_project_dir_recreated_on_append(self):
+        """Test appends recreate a project directory removed after first use."""
+        self.state_manager.initialize_project(
+            project_id=self.project_id,
+            issue_number=self.issue_number,
+            title=self.title
+        )
+        self.state_manager.flush()
+        shutil.rmtree(Path(self.test_dir) / self.project_id)
+        
+        self.state_manager.log_transition(project_id=self.project_id, event_type="after_removal")
+        self.state_manager.flush()
+        events = [t["event_type"] for t in self.state_manager.get_transitions(self.project_id)]
+        self.assertEqual(events, ["after_removal"])
+    
+    def test_small_appends_skip_lock_only_for_single_writer(self):
+        """Test only single-writer managers append small payloads without the lock."""
+        self.state_manager.initialize_project(
+            project_id=self.project_id,
+            issue_number=self.issue_number,
+            title=self.title
+        )
+        self.state_manager.flush()
+        path = Path(self.test_dir) / self.project_id / "transitions.jsonl"
+        
+        with unittest.mock.patch.object(self.state_manager, "_lock", wraps=self.state_manager._lock) as lock:
+            self.state_manager._append_jsonl_lines(path, [b'{"n":1}\n'])
+            lock.assert_called_once_with(path)
+        
+        manager = StateManager(projects_dir=Path(self.test_dir), single_writer=True)
+        with unittest.mock.patch.object(manager, "_lock", wraps=manager._lock) as lock:
+            manager._append_jsonl_lines(path, [b'{"n":2}\n'])
+            lock.assert_not_called()
+            manager._append_jsonl_lines(path, [b'{"n":3}\n' * 1000])
+            lock.assert_called_once_with(path)
+        
+        with open(path, 'rb') as f:
+            self.assertEqual(len(f.readlines()), 1003)
+    
+    def test_get_transitions_limit(self):
+        """Test limit returns the most recent matching entries in order."""
+        self.state_manager.initialize_project(
+            project_id=self.project_id,
+            issue_number=self.issue_number,
+            title=self.title
+        )
+        for i in range(30):
+            self.state_manager.log_transition(
+                project_id=self.project_id,
+                event_type="state_updated",
+                stage="plan" if i % 2 else "specify",
+                metadata={"seq": i, "padding": "x" * 500}
+            )
+        
+        # Small block size forces lines to straddle block boundaries
+        with unittest.mock.patch("core.state_manager.REVERSE_READ_BLOCK_SIZE", 256):
+            latest = self.state_manager.get_transitions(self.project_id, limit=3)
+        self.assertEqual([t["metadata"]["seq"] for t in latest], [27, 28, 29])
+        
+        latest_plan = self.state_manager.get_transitions(self.project_id, stage="plan", limit=2)
+        self.assertEqual([t["metadata"]["seq"] for t in latest_plan], [27, 29])
+        
+        everything = self.state_manager.get_transitions(self.project_id, limit=100)
+        self.assertEqual(everything, self.state_manager.get_transitions(self.project_id))
+        
+        # Lines written with spaced separators (older versions) still match
+        transitions_path = Path(self.test_dir) / self.project_id / "transitions.jsonl"
+        with open(transitions_path, 'a') as f:
+            f.write(json.dumps({"event_type": "stage_failed", "stage": "plan", "metadata": {"seq": 30}}) + "\n")
+            f.write(json.dumps({"event_type": "state_updated", "stage": "plan", "metadata": {"seq": 31}}) + "\n")
+        latest_failed = self.state_manager.get_transitions(self.project_id, event_type="stage_failed", stage="plan", limit=5)
+        self.assertEqual([t["metadata"]["seq"] for t in latest_failed], [30])
+        
+        # An append in progress (no trailing newline yet) is not returned
+        with open(transitions_path, 'a') as f:
+            f.write('{"event_type": "stage_failed", "stage": "pl')
+        with unittest.mock.patch("core.state_manager.REVERSE_READ_BLOCK_SIZE", 16):
+            latest = self.state_manager.get_transitions(self.project_id, limit=2)
+        self.assertEqual([t["metadata"]["seq"] for t in latest], [30, 31])
+        self.assertEqual(self.state_manager.get_transitions(self.project_id, limit=100), self.state_manager.get_transitions(self.project_id))
+    
+    def test_get_transitions_filters_use_index(self):
+        """Test filtered queries match a full scan as the log grows."""
+        self.state_manager.initialize_project(
+            project_id=self.project_id,
+            issue_number=self.issue_number,
+            title=self.title
+        )
+        manager = self.state_manager
+        queries = [("state_updated", None), (None, "plan"), ("stage_started", "plan"), ("missing", None)]
+        for round_number in range(2):
+            for i in range(10):
+                manager.log_transition(
+                    project_id=self.project_id,
+                    event_type="stage_started" if i % 3 else "state_updated",
+                    stage="plan" if i % 2 else None
+                )
+            everything = manager.get_transitions(self.project_id)
+            for event_type, stage in queries:
+                expected = [
+                    t for t in everything
+                    if (not event_type or t["event_type"] == event_type)
+                    and (not stage or t.get("stage") == stage)
+                ]
+                with self.subTest(round=round_number, event_type=event_type, stage=stage):
+                    self.assertEqual(manager.get_transitions(self.project_id, event_type=event_type, stage=stage), expected)
+    
+    def test_get_state_sees_external_writes(self):
+        """Test cached state is invalidated when another writer replaces it."""
+        self.state_manager.initialize_project(
+            project_id=self.project_id,
+            issue_number=self.issue_number,
+            title=self.title
+        )
+        self.assertEqual(self.state_manager.get_state(self.project_id)["status"], "initializing")
+        
+        # Another process (here: a second manager) updates the same project
+        other = StateManager(projects_dir=Path(self.test_dir))
+        other.update_state(self.project_id, {"status": "paused"}, log_transition=False)
+        
+        state = self.state_manager.get_state(self.project_id)
+        self.assertEqual(state["status"], "paused")
+        
+        # Callers get independent copies
+        state["status"] = "mutated"
+        self.assertEqual(self.state_manager.get_state(self.project_id)["status"], "paused")
+    
+    def test_cache_disabled(self):
+        """Test a manager with caching disabled keeps no file copies."""
+        manager = StateManager(projects_dir=Path(self.test_dir), cache_enabled=False)
+        manager.initialize_project(
+            project_id=self.project_id,
+            issue_number=self.issue_number,
+            title=self.title
+        )
+        manager.add_dead_letter(self.project_id, "specify", "specifier", {"type": "ValueError"})
+        
+        self.assertEqual(manager.get_state(self.project_id)["metrics"]["dead_letters"], 1)
+        self.assertEqual(len(manager.get_dead_letters(self.project_id, stage="specify")), 1)
+        self.assertEqual(len(manager.get_transitions(self.project_id)), 2)
+        self.assertEqual(manager._file_cache, {})
+        self.assertEqual(manager._jsonl_cache, {})
+        self.assertEqual(manager._dead_letter_queries, {})
+    
+    def test_unchanged_update_skips_write(self):
+        """Test update_state does not rewrite state.json for a no-op update."""
+        self.state_manager.initialize_project(
+            project_id=self.project_id,
+            issue_number=self.issue_number,
+            title=self.title
+        )
+        manager = self.state_manager
+        before = manager.update_state(self.project_id, {"status": "in_progress"})["updated_at"]
+        
+        with unittest.mock.patch.object(manager, "_write_json_locked") as write:
+            state = manager.update_state(self.project_id, {"status": "in_progress"})
+            manager.update_state(self.project_id, {})
+            write.assert_not_called()
+        self.assertEqual(state["updated_at"], before)
+    
+    def test_batch_writes_state_once(self):
+        """Test mutations inside batch() are written to state.json once."""
+        self.state_manager.initialize_project(
+            project_id=self.project_id,
+            issue_number=self.issue_number,
+            title=self.title
+        )
+        manager = self.state_manager
+        state_path = Path(self.test_dir) / self.project_id / "state.json"
+        
+        with unittest.mock.patch.object(manager, "_write_json_locked", wraps=manager._write_json_locked) as write:
+            with manager.batch(self.project_id):
+                manager.start_stage(self.project_id, "intake", "triage")
+                manager.update_state(self.project_id, {"status": "in_progress"})
+                manager.complete_stage(self.project_id, "intake")
+                
+                # Pending changes are visible to this thread, not yet on disk
+                self.assertEqual(manager.get_state(self.project_id)["stages"]["intake"]["status"], "completed")
+                with open(state_path) as f:
+                    self.assertEqual(json.load(f)["stages"]["intake"]["status"], "pending")
+            
+            state_writes = [c for c in write.call_args_list if c.args[0] == state_path]
+            self.assertEqual(len(state_writes), 1)
+            self.assertTrue(state_writes[0].kwargs["durable"])
+        
+        with open(state_path) as f:
+            state = json.load(f)
+        self.assertEqual(state["stages"]["intake"]["status"], "completed")
+        self.assertEqual(len(state["checkpoints"]), 1)
+        events = [t["event_type"] for t in manager.get_transitions(self.project_id)]
+        self.assertEqual(events[-2:], ["checkpoint_created", "stage_completed"])
+    
+    def test_single_writer_skips_file_locks(self):
+        """Test a single-writer manager takes no cross-process file locks."""
+        manager = StateManager(projects_dir=Path(self.test_dir), single_writer=True)
+        manager.initialize_project(
+            project_id=self.project_id,
+            issue_number=self.issue_number,
+            title=self.title
+        )
+        manager.start_stage(self.project_id, "intake", "triage")
+        manager.fail_stage(self.project_id, "intake", "triage", {"type": "Error", "message": "x"})
+        manager.flush()
+        
+        project_dir = Path(self.test_dir) / self.project_id
+        self.assertEqual(list(project_dir.glob("*.lock")), [])
+        self.assertEqual(len(manager.get_dead_letters(self.project_id)), 1)
+    
+    def test_iso_timestamps_across_seconds(self):
+        """Test cached second prefixes still format every timestamp correctly."""
+        base_ns = 1_700_000_000 * 1_000_000_000
+        for offset_ns in (999_999_999, 1_000_000_000, 1_000_123_456, 0, 86_400_000_000_000):
+            epoch_ns = base_ns + offset_ns
+            expected = (datetime(1970, 1, 1) + timedelta(microseconds=epoch_ns // 1000)).isoformat(timespec="microseconds") + "Z"
+            self.assertEqual(_iso_from_ns(epoch_ns), expected)
+    
+    def test_max_checkpoints_config_parsed_once(self):
+        """Test managers sharing an unchanged config file share one parse."""
+        config_path = Path(self.test_dir) / "config.yml"
+        config_path.write_text("state_manager:\n  max_checkpoints: 3\n")
+        _load_max_checkpoints.cache_clear()
+        
+        for _ in range(3):
+            manager = StateManager(projects_dir=Path(self.test_dir), config_path=config_path)
+            self.assertEqual(manager._get_max_checkpoints(), 3)
+        self.assertEqual(_load_max_checkpoints.cache_info().misses, 1)
+        
+        # A changed file is parsed again
+        config_path.write_text("state_manager:\n  max_checkpoints: 50\n")
+        manager = StateManager(projects_dir=Path(self.test_dir), config_path=config_path)
+        self.assertEqual(manager._get_max_checkpoints(), 50)
+    
+    def test_generated_ids(self):
+        """Test transition and dead letter IDs are unique version 4 UUIDs."""
+        self.state_manager.initialize_project(
+            project_id=self.project_id,
+            issue_number=self.issue_number,
+            title=self.title
+        )
+        ids = [
+            self.state_manager.log_transition(self.project_id, "state_updated")
+            for _ in range(300)
+        ]
+        ids.append(self.state_manager.add_dead_letter(
+            self.project_id, "plan", "planner", {"type": "Error", "message": "boom"}
+        ))
+        
+        self.assertEqual(len(set(ids)), len(ids))
+        for transition_id in ids:
+            parsed = uuid.UUID(transition_id)
+            self.assertEqual(str(parsed), transition_id)
+            self.assertEqual(parsed.version, 4)
+            self.assertEqual(parsed.variant, uuid.RFC_4122)
+        
+        checkpoint_id = self.state_manager.create_checkpoint(self.project_id, "plan")
+        self.assertRegex(checkpoint_id, r'^chk-[0-9a-f]{8}$')
+    
     def test_invalid_project_id(self):
         """Test that invalid project IDs are rejected."""
         # Path traversal attempt
@@ -181,6 +553,38 @@ class TestStateManager(unittest.TestCase):
         checkpoint_created = [t for t in transitions if t["event_type"] == "checkpoint_created"]
         self.assertEqual(len(checkpoint_created), 1)
     
+    def test_complete_stage_duration_from_legacy_state(self):
+        """Test duration falls back to started_at for state without started_at_ns."""
+        self.state_manager.initialize_project(
+            project_id=self.project_id,
+            issue_number=self.issue_number,
+            title=self.title
+        )
+        state = self.state_manager.get_state(self.project_id)
+        state["stages"]["plan"] = {
+            "status": "in_progress",
+            "started_at": "2020-01-01T00:00:00Z"
+        }
+        self.state_manager.update_state(
+            self.project_id, {"stages": state["stages"]}, log_transition=False
+        )
+        
+        state = self.state_manager.complete_stage(
+            project_id=self.project_id,
+            stage="plan",
+            create_checkpoint=False
+        )
+        
+        started = datetime.fromisoformat("2020-01-01T00:00:00+00:00")
+        completed = datetime.fromisoformat(
+            state["stages"]["plan"]["completed_at"].replace('Z', '+00:00')
+        )
+        self.assertAlmostEqual(
+            state["stages"]["plan"]["duration_seconds"],
+            (completed - started).total_seconds(),
+            delta=0.001
+        )
+    
     def test_fail_stage(self):
         """Test recording a stage failure."""
         # Initialize and start
@@ -240,6 +644,199 @@ class TestStateManager(unittest.TestCase):
         
         error_recorded = [t for t in transitions if t["event_type"] == "error_recorded"]
         self.assertEqual(len(error_recorded), 1)
+    
+    def test_load_dead_letters_migrates_legacy_file(self):
+        """Test a pre-JSONL dead_letters.json is converted to JSONL on first read."""
+        self.state_manager.initialize_project(
+            project_id=self.project_id,
+            issue_number=self.issue_number,
+            title=self.title
+        )
+        project_dir = Path(self.test_dir) / self.project_id
+        (project_dir / "dead_letters.stats.json").unlink()
+        with open(project_dir / "dead_letters.json", 'w') as f:
+            json.dump({
+                "project_id": self.project_id,
+                "version": "1.0.0",
+                "entries": [{"id": "legacy", "stage": "specify", "agent": "specifier"}],
+                "statistics": {
+                    "total_entries": 1,
+                    "by_stage": {"specify": 1},
+                    "by_agent": {"specifier": 1},
+                    "recovered": 0,
+                    "unrecovered": 1
+                }
+            }, f)
+        
+        self.state_manager.add_dead_letter(
+            project_id=self.project_id,
+            stage="specify",
+            agent="specifier",
+            error={"type": "ValueError", "message": "bad spec"}
+        )
+        
+        dead_letters = self.state_manager.load_dead_letters(self.project_id)
+        self.assertEqual([e["id"] for e in dead_letters["entries"]][0], "legacy")
+        self.assertEqual(len(dead_letters["entries"]), 2)
+        self.assertEqual(dead_letters["statistics"]["total_entries"], 2)
+        self.assertEqual(dead_letters["statistics"]["by_stage"]["specify"], 2)
+        self.assertEqual(self.state_manager.get_state(self.project_id)["metrics"]["dead_letters"], 2)
+        
+        # Converted once: the legacy file is gone and a fresh manager sees the same data
+        self.assertFalse((project_dir / "dead_letters.json").exists())
+        with open(project_dir / "dead_letters.jsonl", 'rb') as f:
+            self.assertEqual(json.loads(f.readline())["id"], "legacy")
+        self.assertEqual(StateManager(projects_dir=self.test_dir).load_dead_letters(self.project_id), dead_letters)
+    
+    def test_legacy_migration_interrupted_before_unlink(self):
+        """Test a legacy file left behind after conversion is not imported twice."""
+        self.state_manager.initialize_project(
+            project_id=self.project_id,
+            issue_number=self.issue_number,
+            title=self.title
+        )
+        project_dir = Path(self.test_dir) / self.project_id
+        legacy = {
+            "project_id": self.project_id,
+            "version": "1.0.0",
+            "entries": [{"id": "legacy", "stage": "specify", "agent": "specifier"}],
+            "statistics": {"total_entries": 1, "by_stage": {"specify": 1}}
+        }
+        with open(project_dir / "dead_letters.json", 'w') as f:
+            json.dump(legacy, f)
+        with open(project_dir / "dead_letters.jsonl", 'w') as f:
+            f.write(json.dumps(legacy["entries"][0]) + "\n")
+        
+        dead_letters = self.state_manager.load_dead_letters(self.project_id)
+        self.assertEqual([e["id"] for e in dead_letters["entries"]], ["legacy"])
+        self.assertFalse((project_dir / "dead_letters.json").exists())
+    
+    def test_query_results_are_copies(self):
+        """Test mutating returned entries does not change later query results."""
+        self.state_manager.initialize_project(
+            project_id=self.project_id,
+            issue_number=self.issue_number,
+            title=self.title
+        )
+        manager = self.state_manager
+        manager.add_dead_letter(
+            project_id=self.project_id,
+            stage="specify",
+            agent="specifier",
+            error={"type": "ValueError", "message": "bad spec"}
+        )
+        
+        for entry in manager.get_dead_letters(self.project_id, unrecovered_only=True):
+            entry["recovery_attempted"] = True
+            entry["recovery_result"] = "success"
+        next(manager.iter_dead_letters(self.project_id))["stage"] = "changed"
+        manager.load_dead_letters(self.project_id)["entries"][0]["agent"] = "changed"
+        manager.get_transitions(self.project_id)[0]["event_type"] = "changed"
+        
+        self.assertEqual(len(manager.get_dead_letters(self.project_id, unrecovered_only=True)), 1)
+        self.assertEqual(len(manager.get_dead_letters(self.project_id, stage="specify", agent="specifier")), 1)
+        self.assertEqual(manager.get_transitions(self.project_id)[0]["event_type"], "project_initialized")
+    
+    def test_dead_letters_read_incrementally(self):
+        """Test cached dead letter reads pick up appends and skip partial lines."""
+        self.state_manager.initialize_project(
+            project_id=self.project_id,
+            issue_number=self.issue_number,
+            title=self.title
+        )
+        error = {"type": "ValueError", "message": "bad spec"}
+        self.state_manager.add_dead_letter(self.project_id, "specify", "specifier", error)
+        self.assertEqual(len(self.state_manager.get_dead_letters(self.project_id)), 1)
+        
+        self.state_manager.add_dead_letter(self.project_id, "plan", "planner", error)
+        dead_letters = self.state_manager.get_dead_letters(self.project_id)
+        self.assertEqual([e["stage"] for e in dead_letters], ["specify", "plan"])
+        
+        # An append still in progress is not returned until its line is complete
+        dead_letters_path = Path(self.test_dir) / self.project_id / "dead_letters.jsonl"
+        with open(dead_letters_path, 'ab') as f:
+            f.write(b'{"id": "external", "stage": "verify"')
+        self.assertEqual(len(self.state_manager.get_dead_letters(self.project_id)), 2)
+        with open(dead_letters_path, 'ab') as f:
+            f.write(b', "agent": "tester"}\n')
+        self.assertEqual(len(self.state_manager.get_dead_letters(self.project_id, stage="verify")), 1)
+        unrecovered = self.state_manager.get_dead_letters(
+            self.project_id, agent="planner", unrecovered_only=True
+        )
+        self.assertEqual([e["stage"] for e in unrecovered], ["plan"])
+        
+        # Most recent matches come back in file order
+        recent = self.state_manager.get_dead_letters(self.project_id, limit=2)
+        self.assertEqual([e["stage"] for e in recent], ["plan", "verify"])
+        recent = self.state_manager.get_dead_letters(self.project_id, agent="specifier", limit=5)
+        self.assertEqual([e["stage"] for e in recent], ["specify"])
+        
+        # Lazy iteration, newest first
+        newest = next(self.state_manager.iter_dead_letters(
+            self.project_id, unrecovered_only=True, newest_first=True
+        ))
+        self.assertEqual(newest["stage"], "verify")
+        
+        # Rewriting the file invalidates the cached entries
+        self.state_manager.initialize_project(
+            project_id=self.project_id,
+            issue_number=self.issue_number,
+            title=self.title
+        )
+        self.assertEqual(self.state_manager.get_dead_letters(self.project_id), [])
+    
+    def test_dead_letter_queries_memoized(self):
+        """Test repeated queries reuse results until the dead letters change."""
+        self.state_manager.initialize_project(
+            project_id=self.project_id,
+            issue_number=self.issue_number,
+            title=self.title
+        )
+        error = {"type": "ValueError", "message": "bad spec"}
+        self.state_manager.add_dead_letter(self.project_id, "specify", "specifier", error)
+        
+        manager = self.state_manager
+        with unittest.mock.patch.object(manager, "_query_dead_letters", wraps=manager._query_dead_letters) as query:
+            first = manager.get_dead_letters(self.project_id, stage="specify")
+            second = manager.get_dead_letters(self.project_id, stage="specify")
+            self.assertEqual(query.call_count, 1)
+            self.assertEqual(first, second)
+            self.assertIsNot(first, second)
+            
+            manager.add_dead_letter(self.project_id, "specify", "specifier", error)
+            self.assertEqual(len(manager.get_dead_letters(self.project_id, stage="specify")), 2)
+            self.assertEqual(query.call_count, 2)
+    
+    def test_compact_dead_letters(self):
+        """Test compaction removes only old, successfully recovered entries."""
+        self.state_manager.initialize_project(
+            project_id=self.project_id,
+            issue_number=self.issue_number,
+            title=self.title
+        )
+        error = {"type": "ValueError", "message": "bad spec"}
+        self.state_manager.add_dead_letter(self.project_id, "specify", "specifier", error)
+        
+        dead_letters_path = Path(self.test_dir) / self.project_id / "dead_letters.jsonl"
+        recovered = {"recovery_attempted": True, "recovery_result": "success"}
+        with open(dead_letters_path, 'a') as f:
+            f.write(json.dumps({"id": "old-recovered", "timestamp": "2020-01-01T00:00:00Z",
+                                "stage": "plan", "agent": "planner", **recovered}) + "\n")
+            f.write(json.dumps({"id": "old-unrecovered", "timestamp": "2020-01-01T00:00:00Z",
+                                "stage": "plan", "agent": "planner"}) + "\n")
+        self.assertEqual(len(self.state_manager.get_dead_letters(self.project_id)), 3)
+        
+        removed = self.state_manager.compact_dead_letters(self.project_id, older_than_days=30)
+        
+        self.assertEqual(removed, 1)
+        ids = [e["id"] for e in self.state_manager.get_dead_letters(self.project_id)]
+        self.assertNotIn("old-recovered", ids)
+        self.assertIn("old-unrecovered", ids)
+        self.assertEqual(len(ids), 2)
+        # Compaction leaves the statistics untouched
+        stats = self.state_manager.load_dead_letters(self.project_id)["statistics"]
+        self.assertEqual(stats["total_entries"], 1)
+        self.assertEqual(self.state_manager.compact_dead_letters(self.project_id, 30), 0)
 
 
 class TestConcurrentAccess(unittest.TestCase):
@@ -253,7 +850,8 @@ class TestConcurrentAccess(unittest.TestCase):
     
     def tearDown(self):
         """Clean up test fixtures."""
-        # Remove temporary directory
+        # Write out buffered transitions, then remove temporary directory
+        self.state_manager.flush()
         shutil.rmtree(self.test_dir)
     
     def test_parallel_checkpoint_writes(self):
@@ -407,6 +1005,7 @@ class TestSecurityValidation(unittest.TestCase):
     
     def tearDown(self):
         """Clean up test fixtures."""
+        self.state_manager.flush()
         shutil.rmtree(self.test_dir)
     
     def test_project_id_rejects_path_traversal(self):
@@ -435,6 +1034,7 @@ class TestSecurityValidation(unittest.TestCase):
             'my-project"; rm -rf /; echo "',
             'project-1|cat /etc/passwd',
             'project-1\nrm -rf /',
+            'project-1\n',
         ]
         
         for bad_id in malicious_ids:
@@ -573,7 +1173,8 @@ class TestFullPipelineStateTracking(unittest.TestCase):
         
     def tearDown(self):
         """Clean up test fixtures."""
-        # Remove temporary directory
+        # Write out buffered transitions, then remove temporary directory
+        self.state_manager.flush()
         shutil.rmtree(self.test_dir)
     
     def test_all_stages_tracked_sequentially(self):